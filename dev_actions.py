@@ -1,63 +1,131 @@
 # Poetry doesn't have a command-sequencer, and running "poetry run <foo>" four times for
 # different values of <foo> is really annoying, so wrap them up here.
 
+import hashlib
+import json
 import subprocess
 import os
-import stat
 import sys
 
+_BASEDIR = os.path.dirname(os.path.realpath(__file__))
 _MODULE = "sistrum"
-
-def check():
-    basedir = os.path.dirname(os.path.realpath(__file__))
-
-    e = subprocess.run(["black", "--check", _MODULE], cwd=basedir)
+_TESTS = "tests"
+_DOCS = "docs"
+_CACHE_FILE = ".sistrum_check_cache.json"
+# Files that change how everything is checked (dependencies, linter settings, hooks)
+_CONFIG_FILES = ("pyproject.toml", "poetry.lock", ".pre-commit-config.yaml")
+
+
+def _hash_file(path):
+    with open(os.path.join(_BASEDIR, path), "rb") as fd:
+        return hashlib.sha1(fd.read()).hexdigest()
+
+
+def _hash_sources():
+    """\
+    Map each module/test source file, config file, and docs source file (relative path)
+    to the SHA-1 of its contents.
+    """
+    hashes = {}
+    for directory in (_MODULE, _TESTS):
+        for name in sorted(os.listdir(os.path.join(_BASEDIR, directory))):
+            if name.endswith(".py"):
+                path = directory + "/" + name
+                hashes[path] = _hash_file(path)
+    for path in _CONFIG_FILES:
+        hashes[path] = _hash_file(path)
+    for root, dirs, files in os.walk(os.path.join(_BASEDIR, _DOCS)):
+        # (skipping the build output)
+        dirs[:] = sorted(d for d in dirs if d != "_build")
+        for name in sorted(files):
+            path = os.path.relpath(os.path.join(root, name), _BASEDIR).replace(os.sep, "/")
+            hashes[path] = _hash_file(path)
+    return hashes
+
+
+def _load_cache():
+    try:
+        with open(os.path.join(_BASEDIR, _CACHE_FILE), "r") as fd:
+            return json.load(fd)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(hashes):
+    with open(os.path.join(_BASEDIR, _CACHE_FILE), "w") as fd:
+        json.dump(hashes, fd, indent=1, sort_keys=True)
+
+
+def _run_concurrently(procs):
+    """Wait on a list of (name, Popen) pairs, exiting if any of them failed."""
+    returncodes = [(name, proc.wait()) for name, proc in procs]
+    failed = [(name, returncode) for name, returncode in returncodes if returncode != 0]
+    if failed:
+        print("*** check failed: " + ", ".join(name for name, _ in failed))
+        sys.exit(failed[0][1])
+
+
+def _lint_procs(files):
+    if not files:
+        return []
+    # The test run is handled separately (under coverage), so skip that hook here.
+    env = dict(os.environ, SKIP="pytest")
+    return [("lint", subprocess.Popen(["pre-commit", "run", "--files"] + files, cwd=_BASEDIR, env=env))]
+
+
+def check_fast():
+    """Run all of the pre-commit hooks (linting and tests) over the whole tree."""
+    e = subprocess.run(["pre-commit", "run", "--all-files"], cwd=_BASEDIR, check=False)
     if e.returncode != 0:
         sys.exit(e.returncode)
 
-    # Run linter
-    e = subprocess.run(["pylint", _MODULE], cwd=basedir)
-    if e.returncode != 0:
-        sys.exit(e.returncode)
 
-    # Update docs
-    e = subprocess.run(["make", "html"], cwd=os.path.join(basedir, "docs"))
-    if e.returncode != 0:
-        sys.exit(e.returncode)
+def check_full():
+    """Lint, build the docs, and run the tests under coverage."""
+    # Only re-examine files whose contents changed since the last successful check.
+    hashes = _hash_sources()
+    cached = _load_cache()
+    if any(cached.get(path) != hashes[path] for path in _CONFIG_FILES):
+        # the tools or their settings changed, so none of the earlier results count
+        cached = {}
+    dirty = [path for path, digest in hashes.items() if cached.get(path) != digest]
+    dirty_module = [path for path in dirty if path.startswith(_MODULE + "/")]
+
+    # Formatting, linting, and the docs build don't depend on each other, so
+    # run them all at once and then wait for them to finish.
+    procs = _lint_procs(dirty_module)
+    procs.append(("docs", subprocess.Popen(["make", "html"], cwd=os.path.join(_BASEDIR, "docs"))))
+    _run_concurrently(procs)
+
+    # Code coverage, with the tests spread across all cores. pytest-cov (rather than
+    # "coverage run") is what collects and combines the data from the xdist workers.
+    # Every test module can depend on any module, so if anything other than the docs
+    # changed, run the whole suite; the cache only lets us skip the run entirely.
+    code_changed = any(not path.startswith(_DOCS + "/") for path in dirty)
+    if code_changed or not os.path.exists(os.path.join(_BASEDIR, ".coverage")):
+        e = subprocess.run(["pytest", "-n", "auto", "--cov=" + _MODULE, "--cov-report="], cwd=_BASEDIR, check=False)
+        if e.returncode != 0:
+            sys.exit(e.returncode)
+        e = subprocess.run(["coverage", "html"], cwd=_BASEDIR, check=False)
+        if e.returncode != 0:
+            sys.exit(e.returncode)
+
+    _save_cache(hashes)
 
-    # Code coverage
-    e = subprocess.run(["coverage", "run", "-m", "--source=" + _MODULE, "pytest"], cwd=basedir)
-    if e.returncode != 0:
-        sys.exit(e.returncode)
-    e = subprocess.run(["coverage", "html"], cwd=basedir)
-    if e.returncode != 0:
-        sys.exit(e.returncode)
+
+def check():
+    check_full()
 
 
 def pre_commit_hook():
-    check()
+    # pre-commit only looks at what's staged, and leaves docs and coverage for the
+    # full check in CI.
+    e = subprocess.run(["pre-commit", "run"], cwd=_BASEDIR, check=False)
+    if e.returncode != 0:
+        sys.exit(e.returncode)
 
 
 def install_hooks():
-    basedir = os.path.dirname(os.path.realpath(__file__))
-
-    pre_commit_hook_str = r'''
-#!/bin/sh
-
-POETRY=$(which poetry)
-if [ "$POETRY" = "" ]; then
-	echo "*** Can't find poetry to invoke pre-commit hook!"
-fi
-if [ -e "$POETRY.bat" ]; then
-	# On Windows, we want to run the .bat file sitting alongside.
-	POETRY="$POETRY.bat"
-fi
-
-exec $POETRY run pre_commit_hook
-'''.lstrip('\n')
-
-    pre_commit_path = os.path.join(basedir, ".git", "hooks", "pre-commit")
-
-    with open(pre_commit_path, "w") as fd:
-        fd.write(pre_commit_hook_str)
-    os.chmod(pre_commit_path, stat.S_IRWXU | stat.S_IRGRP | stat.S_IROTH)
+    e = subprocess.run(["pre-commit", "install"], cwd=_BASEDIR, check=False)
+    if e.returncode != 0:
+        sys.exit(e.returncode)
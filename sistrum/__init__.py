@@ -1,7 +1,5 @@
 from __future__ import absolute_import
 
-from sistrum._device import ExtronDevice
-
 from sistrum._enums import (
     AspectMode,
     ExecutiveMode,
@@ -36,3 +34,20 @@ __all__ = [
 ]
 
 __version__ = "0.1.0"
+
+# names that __getattr__ provides, rather than being imported up front
+_LAZY_ATTRS = ("ExtronDevice",)
+
+
+def __getattr__(name):
+    # ExtronDevice pulls in pyserial, which is comparatively slow to import; defer
+    # that until someone actually asks for it.
+    if name == "ExtronDevice":
+        from sistrum._device import ExtronDevice  # noqa: PLC0415
+
+        return ExtronDevice
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
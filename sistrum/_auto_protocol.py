@@ -1,3 +1,6 @@
+import time
+import types
+
 import serial.threaded  # type: ignore
 from sistrum.device_dvs304 import ExtronDVS304Protocol
 from sistrum.device_mps112 import ExtronMPS112Protocol
@@ -5,25 +8,24 @@ from sistrum._protocol import ExtronProtocol
 from sistrum._part_numbers import PartNumber
 
 
-_PROTOCOL_INDEX = {
-    PartNumber.EXTRON_DVS_304: ExtronDVS304Protocol,
-    PartNumber.EXTRON_DVS_304_A: ExtronDVS304Protocol,
-    PartNumber.EXTRON_DVS_304_D: ExtronDVS304Protocol,
-    PartNumber.EXTRON_DVS_304_AD: ExtronDVS304Protocol,
-    PartNumber.EXTRON_DVS_304_DVI: ExtronDVS304Protocol,
-    PartNumber.EXTRON_DVS_304_DVI_A: ExtronDVS304Protocol,
-    PartNumber.EXTRON_DVS_304_DVI_D: ExtronDVS304Protocol,
-    PartNumber.EXTRON_DVS_304_DVI_AD: ExtronDVS304Protocol,
-    PartNumber.EXTRON_MPS_112: ExtronMPS112Protocol,
-    PartNumber.EXTRON_MPS_112CS: ExtronMPS112Protocol,
-}
+_PROTOCOL_INDEX = types.MappingProxyType(
+    {
+        PartNumber.EXTRON_DVS_304: ExtronDVS304Protocol,
+        PartNumber.EXTRON_DVS_304_A: ExtronDVS304Protocol,
+        PartNumber.EXTRON_DVS_304_D: ExtronDVS304Protocol,
+        PartNumber.EXTRON_DVS_304_AD: ExtronDVS304Protocol,
+        PartNumber.EXTRON_DVS_304_DVI: ExtronDVS304Protocol,
+        PartNumber.EXTRON_DVS_304_DVI_A: ExtronDVS304Protocol,
+        PartNumber.EXTRON_DVS_304_DVI_D: ExtronDVS304Protocol,
+        PartNumber.EXTRON_DVS_304_DVI_AD: ExtronDVS304Protocol,
+        PartNumber.EXTRON_MPS_112: ExtronMPS112Protocol,
+        PartNumber.EXTRON_MPS_112CS: ExtronMPS112Protocol,
+    }
+)
 
 
 def get_protocol_class_for_part_number(part):
-    if part in _PROTOCOL_INDEX:
-        return _PROTOCOL_INDEX[part]
-    else:
-        return ExtronProtocol
+    return _PROTOCOL_INDEX.get(part, ExtronProtocol)
 
 
 class AutoExtronProtocol(serial.threaded.Protocol):
@@ -45,21 +47,31 @@ class AutoExtronProtocol(serial.threaded.Protocol):
         model.
         """
         ser = transport.serial
-        buffer = bytearray()
 
         # Send part number request
         ser.write("N".encode("latin-1", "replace"))
 
-        # block for read
+        # block for read, taking whatever has arrived at a time; this gives up after the
+        # port's timeout, in which case we fall back to the generic protocol.
+        deadline = None if ser.timeout is None else time.monotonic() + ser.timeout
+        buffer = bytearray()
+        part_number = None
         while ser.is_open:
-            data = ser.read(ser.in_waiting or 1)
-            buffer.extend(data)
-            if self.TERMINATOR in buffer:
-                packet, buffer = buffer.split(self.TERMINATOR, 1)
-                part_number = packet.decode("latin-1", "replace")
-                proto_class = get_protocol_class_for_part_number(part_number)
-                if proto_class is not None:
-                    new_proto = proto_class()
-                    transport.protocol = new_proto
-                    new_proto.connection_made(transport)
-                    return
+            # (only the new data, and the end of what came before it, can hold the terminator)
+            start = max(0, len(buffer) - len(self.TERMINATOR) + 1)
+            buffer.extend(ser.read(ser.in_waiting or 1))
+            end = buffer.find(self.TERMINATOR, start)
+            if end >= 0:
+                try:
+                    part_number = PartNumber(buffer[:end].decode("latin-1", "replace"))
+                except ValueError:
+                    # not a model we know about
+                    pass
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        proto_class = get_protocol_class_for_part_number(part_number)
+        new_proto = proto_class()
+        transport.protocol = new_proto
+        new_proto.connection_made(transport)
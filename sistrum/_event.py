@@ -1,4 +1,5 @@
-from typing import Any, Callable, Text, Mapping, Optional, Iterable
+from typing import Any, Callable, Dict, Text, Mapping, Optional, Iterable, Pattern, Sequence
+import functools
 import re
 import collections.abc
 
@@ -57,6 +58,15 @@ class ValueChangeEvent(Event):
         #: The updated value
         self.value = value
 
+    @classmethod
+    def _new(cls, value: Any) -> "ValueChangeEvent":
+        # Fast constructor for matchers; the name and source get filled in at dispatch.
+        self = cls.__new__(cls)
+        self.name = None
+        self.source = None
+        self.value = value
+        return self
+
 
 class IndexValueChangeEvent(ValueChangeEvent):
     """\
@@ -72,6 +82,21 @@ class IndexValueChangeEvent(ValueChangeEvent):
         #: The updated value
         self.index = index
 
+    @classmethod
+    def _new(cls, value: Any, index: int) -> "IndexValueChangeEvent":
+        # Fast constructor for matchers; the name and source get filled in at dispatch.
+        self = cls.__new__(cls)
+        self.name = None
+        self.source = None
+        self.value = value
+        self.index = index
+        return self
+
+
+# Returned by matchers for events that carry no payload. This is shared, so it must
+# never be modified or passed to listeners; the dispatcher creates a real Event instead.
+_NULL_EVENT = Event(None, None)
+
 
 # TODO: This interface is not great.
 #       Is there something we can do to replace it? That might also work with primitive types?
@@ -81,12 +106,10 @@ class IndexValueChangeEvent(ValueChangeEvent):
 class ValueConverter:
     def to_api(self, obj: str) -> Any:
         """Convert a string sequence from the serial protocol into an API-visible value."""
-        # pylint: disable=unused-argument
         return None
 
     def to_raw(self, obj) -> str:
         """Convert an API-visible value into a raw string suitable for transmission."""
-        # pylint: disable=unused-argument
         return ""
 
 
@@ -101,8 +124,35 @@ class BasicValueConverter(ValueConverter):
         return "{0:d}".format(obj)
 
 
-_BOOL_VALUE_CONVERTER = BasicValueConverter(bool)
-_INT_VALUE_CONVERTER = BasicValueConverter(int)
+class _BoolValueConverter(BasicValueConverter):
+    def __init__(self):
+        super().__init__(bool)
+
+    def to_api(self, obj: str) -> Any:
+        # bool("0") is True, so go through int
+        return bool(int(obj))
+
+    def to_raw(self, obj) -> str:
+        # (bools and ints only; anything else fails, rather than being sent as its truthiness)
+        if not isinstance(obj, int):
+            raise ValueError("Unable to convert {0!r} to a bool".format(obj))
+        return "1" if obj else "0"
+
+
+class _IntValueConverter(BasicValueConverter):
+    def __init__(self):
+        super().__init__(int)
+
+    def to_raw(self, obj) -> str:
+        # (exactly int; not an isinstance check, which would let bools through)
+        if obj.__class__ is int:
+            return str(obj)
+        # bools, int subclasses, and things that aren't ints at all (which raise)
+        return super().to_raw(obj)
+
+
+_BOOL_VALUE_CONVERTER = _BoolValueConverter()
+_INT_VALUE_CONVERTER = _IntValueConverter()
 
 
 class EnumValueConverter(ValueConverter):
@@ -110,19 +160,28 @@ class EnumValueConverter(ValueConverter):
         self.mapping = mapping
         self.prim_type = next(iter(mapping.values())).__class__
 
+        # reverse mapping for to_raw; if a value appears more than once, the first key wins
+        self._inverse: Dict[Any, str] = {}
+        for key, val in mapping.items():
+            self._inverse.setdefault(val, key)
+
     def to_api(self, obj: str) -> Any:
         return self.mapping[obj]
 
     def to_raw(self, obj) -> str:
-        for key, val in self.mapping.items():
-            if val == obj:
-                return key
-        raise ValueError("Unable to find match for {0}".format(obj))
+        try:
+            return self._inverse[obj]
+        except (KeyError, TypeError):
+            raise ValueError("Unable to find match for {0}".format(obj)) from None
 
 
 # The main EventProperty container. This is a `property`, but also contains
 # an additional `fmatch` field for a Callable for checking that an input
-# line matches an event occurrance.
+# line matches an event occurrance, a `pattern` field with the regular
+# expression `fmatch` tests against (or None if unknown), an `fbuild` field
+# for a Callable that makes the event from that expression's groups (set
+# whenever `pattern` is), and a `prefix` field with literal text that any line
+# matched by `fmatch` must start with (or "" if unknown).
 #
 # (Note: This comment is not a docstring, because we want to override the
 #        docstring at each individual instance.)
@@ -133,13 +192,26 @@ class EventProperty(property):
         fset: Optional[Callable[[Any, Any], None]] = None,
         fmatch: Optional[Callable[[Any, str], Optional[Event]]] = None,
         doc: Optional[Text] = None,
+        pattern: Optional[str] = None,
+        fbuild: Optional[Callable[[Sequence[Optional[str]]], Event]] = None,
+        prefix: str = "",
     ):
         super().__init__(fget=fget, fset=fset, fdel=None, doc=doc)
         self.fmatch = fmatch
+        self.pattern = pattern
+        self.fbuild = fbuild
+        self.prefix = prefix
         if doc is None and fget is not None:
             doc = fget.__doc__
         self.__doc__ = doc
 
+    def __set_name__(self, owner, name):
+        # Register with the class we're defined in, so that it can find its event
+        # properties without searching through all of its attributes.
+        if "_own_event_properties" not in owner.__dict__:
+            owner._own_event_properties = []
+        owner._own_event_properties.append(name)
+
     def matcher(self, fmatch):
         return type(self)(self.fget, self.fset, fmatch, self.__doc__)
 
@@ -177,12 +249,28 @@ class _ArrayEventProperty(collections.abc.Mapping):
         return self._indices.__contains__(item)
 
 
+def _to_api_fn(type_converter):
+    """\
+    Return the most direct callable equivalent to type_converter.to_api, for use in
+    generated functions: the type itself or the mapping lookup for the basic converters,
+    otherwise the bound method.
+    """
+    to_api = type(type_converter).to_api
+    if to_api is BasicValueConverter.to_api:
+        return type_converter.prim_type
+    if to_api is EnumValueConverter.to_api:
+        return type_converter.mapping.__getitem__
+    return type_converter.to_api
+
+
 def _make_getter(doc, type_converter, get_cmd):
     if get_cmd is None:
         return None
 
+    to_api = _to_api_fn(type_converter)
+
     def getter(self):
-        return type_converter.to_api(self.make_request(get_cmd))
+        return to_api(self.make_request(get_cmd))
 
     getter.__doc__ = doc
     getter.__annotations__ = {"return": type_converter.prim_type}
@@ -198,7 +286,6 @@ def _make_doconly_getter(doc):
     if _is_sphinx_build():
 
         def fake_fget(self) -> None:
-            # pylint: disable=unused-argument,function-redefined
             pass
 
         fake_fget.__doc__ = doc
@@ -224,8 +311,10 @@ def _make_getitemmer(doc, type_converter, get_cmd):
     if get_cmd is None:
         return None
 
+    to_api = _to_api_fn(type_converter)
+
     def getitemmer(self, index):
-        return type_converter.to_api(self.make_request(get_cmd.format(index=index)))
+        return to_api(self.make_request(get_cmd.format(index=index)))
 
     getitemmer.__doc__ = doc
     getitemmer.__annotations__ = {"return": type_converter.prim_type}
@@ -250,45 +339,122 @@ def _make_indexed_getter(doc, indices, fgetitem, fsetitem):
         return _ArrayEventProperty(parent=self, indices=indices, fgetitem=fgetitem, fsetitem=fsetitem)
 
     getter.__doc__ = doc
-    getter.__annotations__ = {"return": Mapping[int, fgetitem.__annotations__["return"]]}  # type: ignore
+    value_type = fgetitem.__annotations__["return"]
+    getter.__annotations__ = {"return": Mapping[int, value_type]}
 
     return getter
 
 
-def _make_event_matcher(set_cmd_response_re):
-    def matcher(self, line):
-        # pylint: disable=unused-argument
-        match = set_cmd_response_re.match(line)
-        if match:
-            return Event(None, None)
-        else:
-            return None
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the literal text that any line matching this pattern must start with."""
+    if not pattern.startswith("^") or "|" in pattern:
+        return ""
+    prefix = []
+    for char in pattern[1:]:
+        if char in _REGEX_METACHARS:
+            if char in "*?{" and prefix:
+                # quantifier; the preceding character might not be there at all
+                prefix.pop()
+            break
+        prefix.append(char)
+    return "".join(prefix)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(pattern: str) -> Pattern[str]:
+    """Compile a response pattern, sharing the result between properties using the same one."""
+    return re.compile(pattern)
+
+
+def _make_event_builder():
+    def builder(groups):
+        return _NULL_EVENT
+
+    return builder
 
-    return matcher
 
+def _make_valuechangeevent_builder(type_converter):
+    to_api = _to_api_fn(type_converter)
+
+    def builder(groups):
+        return ValueChangeEvent._new(to_api(groups[0]))
+
+    return builder
+
+
+def _make_indexvaluechangeevent_builder(type_converter):
+    to_api = _to_api_fn(type_converter)
+
+    def builder(groups):
+        return IndexValueChangeEvent._new(value=to_api(groups[1]), index=int(groups[0]))
+
+    return builder
+
+
+def _make_matcher(builder, set_cmd_response_re):
+    match_fn = set_cmd_response_re.match
 
-def _make_valuechangeevent_matcher(type_converter, set_cmd_response_re):
     def matcher(self, line):
-        # pylint: disable=unused-argument
-        match = set_cmd_response_re.match(line)
+        match = match_fn(line)
         if match:
-            return ValueChangeEvent(None, None, type_converter.to_api(match[1]))
+            return builder(match.groups())
         else:
             return None
 
     return matcher
 
 
-def _make_indexvaluechangeevent_matcher(type_converter, set_cmd_response_re):
-    def matcher(self, line):
-        # pylint: disable=unused-argument
-        match = set_cmd_response_re.match(line)
-        if match:
-            return IndexValueChangeEvent(None, None, int(match[1]), type_converter.to_api(match[2]))
+def _type_converter(type_: Any) -> ValueConverter:
+    """Return the converter for a property's type: the built-in ones for bool and int, else the type itself."""
+    if type_ is bool:
+        return _BOOL_VALUE_CONVERTER
+    elif type_ is int:
+        return _INT_VALUE_CONVERTER
+    else:
+        return type_
+
+
+def _make_accessors(doc, type_, indices, get_cmd, set_cmd, fget, fset, need_fbuild):
+    """\
+    Make whichever of fget and fset weren't given directly (for generic_event_property),
+    and, if need_fbuild, the builder for the property's events.
+
+    Returns (fget, fset, fbuild).
+    """
+    fbuild = None
+
+    # None is for device-initiated events that are unassociated with any configuration;
+    # the "Reconfig" event on the DVS 304 is a good example.
+    if type_ is None:
+        if get_cmd is not None or set_cmd is not None:
+            raise ValueError("get/set must be unspecified for None-type events")
+
+        fget = _make_doconly_getter(doc)
+        if need_fbuild:
+            fbuild = _make_event_builder()
+
+    else:
+        type_converter = _type_converter(type_)
+
+        if indices is not None:
+            if fget is None:
+                fgetitem = _make_getitemmer(doc, type_converter, get_cmd)
+                fsetitem = _make_setitemmer(doc, type_converter, set_cmd)
+                fget = _make_indexed_getter(doc, indices, fgetitem, fsetitem)
+            if need_fbuild:
+                fbuild = _make_indexvaluechangeevent_builder(type_converter)
         else:
-            return None
+            if fget is None:
+                fget = _make_getter(doc, type_converter, get_cmd)
+            if fset is None:
+                fset = _make_setter(doc, type_converter, set_cmd)
+            if need_fbuild:
+                fbuild = _make_valuechangeevent_builder(type_converter)
 
-    return matcher
+    return fget, fset, fbuild
 
 
 def generic_event_property(
@@ -317,8 +483,6 @@ def generic_event_property(
     :param Optional[Callable[[Any, T], None]] fset: direct fset function
     :param Optional[Callable[[Any, str], Optional[Event]]] fmatch: direct fmatch function
     """
-    # pylint: disable=too-many-branches
-
     if get_cmd is not None and fget is not None:
         raise ValueError("choose only one of get_cmd and fget, but not both")
 
@@ -326,48 +490,25 @@ def generic_event_property(
         if indices is None:
             raise ValueError("choose only one of set_cmd and fset, but not both")
 
+    pattern = None
+    prefix = ""
     if set_cmd_response:
-        set_cmd_response_re = re.compile(set_cmd_response)
-
-    # None is for device-initiated events that are unassociated with any configuration;
-    # the "Reconfig" event on the DVS 304 is a good example.
-    if type_ is None:
-
-        if get_cmd is not None or set_cmd is not None:
-            raise ValueError("get/set must be unspecified for None-type events")
-
-        fget = _make_doconly_getter(doc)
+        set_cmd_response_re = _compile(set_cmd_response)
         if fmatch is None:
-            fmatch = _make_event_matcher(set_cmd_response_re)
-
-    else:
+            pattern = set_cmd_response
+            prefix = _literal_prefix(set_cmd_response)
 
-        type_converter: ValueConverter
-        if type_ is bool:
-            type_converter = _BOOL_VALUE_CONVERTER
-        elif type_ is int:
-            type_converter = _INT_VALUE_CONVERTER
-        else:
-            type_converter = type_
+    fget, fset, fbuild = _make_accessors(doc, type_, indices, get_cmd, set_cmd, fget, fset, fmatch is None)
 
-        if indices is not None:
-            if fget is None:
-                fgetitem = _make_getitemmer(doc, type_converter, get_cmd)
-                fsetitem = _make_setitemmer(doc, type_converter, set_cmd)
-                fget = _make_indexed_getter(doc, indices, fgetitem, fsetitem)
-            if fmatch is None:
-                fmatch = _make_indexvaluechangeevent_matcher(type_converter, set_cmd_response_re)
-        else:
-            if fget is None:
-                fget = _make_getter(doc, type_converter, get_cmd)
-            if fset is None:
-                fset = _make_setter(doc, type_converter, set_cmd)
-            if fmatch is None:
-                fmatch = _make_valuechangeevent_matcher(type_converter, set_cmd_response_re)
+    if fbuild is not None:
+        fmatch = _make_matcher(fbuild, set_cmd_response_re)
 
     return EventProperty(
         doc=doc,
         fget=fget,
         fset=fset,
         fmatch=fmatch,
+        pattern=pattern,
+        fbuild=fbuild,
+        prefix=prefix,
     )
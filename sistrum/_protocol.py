@@ -1,19 +1,88 @@
+import queue
 import threading
 import logging
-import inspect
-import copy
-from typing import Callable
+import re
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import serial.threaded  # type: ignore
 
 from sistrum.exceptions import exception_from_error_code
-from sistrum._event import Event, EventProperty
+from sistrum._event import Event, EventProperty, _NULL_EVENT
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 __all__ = ["ExtronProtocol"]
 
+# An error response: "E" and the error code, e.g. "E13". (Devices zero-pad the code,
+# and E30 may be followed by a colon and a descriptor.)
+_ERROR_RE = re.compile(r"^E\d+(?::|$)")
+
+# Backreferences in a pattern, which would refer to the wrong group once it's combined with
+# others. (This can also catch an escaped backslash followed by a digit; such patterns are
+# just matched on their own.)
+_BACKREFERENCE_RE = re.compile(r"\\(?:[1-9]|g<)|\(\?P=")
+
+
+def _combinable(pattern: str) -> bool:
+    """\
+    Whether a pattern can be spliced into a combined alternation and still mean the same thing.
+
+    That rules out global inline flags like ``(?i)`` (which must come first, and would apply to
+    every alternative anyway), backreferences, and named groups (which could clash).
+    """
+    try:
+        compiled = re.compile(pattern)
+    except re.error:
+        return False
+    return compiled.flags == re.UNICODE and not compiled.groupindex and not _BACKREFERENCE_RE.search(pattern)
+
+
+class _EventDispatcher:
+    """\
+    Finds which of a group of event properties matches a line.
+
+    Properties with a known pattern are combined into one alternation, with a named group
+    per property, so a line that matches none of them costs a single regex match, and one
+    that does is built straight from that match's groups. Properties whose patterns can't be
+    combined (see _combinable) are matched on their own, as are ones without a pattern.
+    """
+
+    __slots__ = ("_match", "_builders", "_fallback")
+
+    def __init__(self, members: Iterable[Tuple[str, EventProperty]]):
+        members = tuple(members)
+        patterned = [(name, prop) for name, prop in members if prop.pattern is not None and _combinable(prop.pattern)]
+        self._fallback = tuple((name, prop) for name, prop in members if (name, prop) not in patterned)
+        if patterned:
+            combined = re.compile("|".join("(?P<{0}>{1})".format(name, prop.pattern) for name, prop in patterned))
+            self._match = combined.match
+            # For each property, the slice of the combined match's groups() that holds the
+            # groups of its own pattern (which come right after the property's named group).
+            self._builders = {}
+            for name, prop in patterned:
+                start = combined.groupindex[name]
+                self._builders[name] = (name, prop.fbuild, start, start + re.compile(prop.pattern).groups)
+        else:
+            self._match = None
+            self._builders = {}
+
+    def find(self, protocol: Any, line: str) -> Optional[Tuple[str, Event]]:
+        if self._match is not None:
+            match = self._match(line)
+            if match:
+                # Each property's group encloses any groups in its own pattern, so it's
+                # the last one to close.
+                # (Return the attribute name, not lastgroup; it's interned, and so are the
+                # names listeners are registered under, so the listener lookup is by identity.)
+                name, fbuild, start, end = self._builders[match.lastgroup]
+                return name, fbuild(match.groups()[start:end])
+        for name, prop in self._fallback:
+            event_obj = prop.fmatch(protocol, line)
+            if event_obj:
+                return name, event_obj
+        return None
+
 
 class _ExtronProtocol(serial.threaded.LineReader):
     """\
@@ -26,73 +95,147 @@ class _ExtronProtocol(serial.threaded.LineReader):
     TERMINATOR = b"\r\n"
     ENCODING = "latin-1"
 
+    # (name, EventProperty) pairs for this class, and dispatchers for them; filled in by __init_subclass__
+    _event_members: Tuple[Tuple[str, EventProperty], ...] = ()
+    _unprefixed_event_dispatch = _EventDispatcher(())
+    _event_dispatch_by_prefix: Dict[str, _EventDispatcher] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # We don't expect new properties to be added to the class after it's been
+        # created, so find the event properties once here rather than per-instance.
+        # Each class lists the names of the ones it defines (see EventProperty.__set_name__);
+        # a name may be redefined by a subclass, so look up what it resolves to here.
+        # (Sorted by name, for a consistent dispatch order.)
+        names = {name for klass in cls.__mro__ for name in klass.__dict__.get("_own_event_properties", ())}
+        members = []
+        for name in sorted(names):
+            attr = next(klass.__dict__[name] for klass in cls.__mro__ if name in klass.__dict__)
+            if isinstance(attr, EventProperty):
+                members.append((name, attr))
+        cls._event_members = tuple(members)
+
+        # Bucket the event properties by the first character of their literal prefix, so that
+        # each line is only tested against properties that could possibly match it. Properties
+        # without a known prefix go in every bucket. (Order is preserved within each bucket.)
+        cls._unprefixed_event_dispatch = _EventDispatcher(
+            (name, prop) for name, prop in cls._event_members if not prop.prefix
+        )
+        cls._event_dispatch_by_prefix = {
+            key: _EventDispatcher((name, prop) for name, prop in cls._event_members if prop.prefix[:1] in ("", key))
+            for key in {prop.prefix[:1] for _, prop in cls._event_members if prop.prefix}
+        }
+
     def __init__(self):
         super().__init__()
-        self._line_handler_event = threading.Event()
-        self._waiting_for_response = False
-        self._response = None
-        self._response_exception = None
+        # make_request holds the lock for as long as it's waiting on a response, and handle_line
+        # hands (line, exception) pairs back through the queue.
+        self._request_lock = threading.Lock()
+        self._response_queue: "queue.SimpleQueue[Tuple[str, Optional[Exception]]]" = queue.SimpleQueue()
 
-        # list of (name, listener) tuples. probably room for a more efficient data structure here...
-        self._listeners = []
-
-        # We don't expect new properties to be added to the class after __init__
-        # (should this be cached in the class members?)
-        self._event_members = copy.copy(inspect.getmembers(self.__class__, lambda o: isinstance(o, EventProperty)))
+        # (name, listener) pairs in the order they were added: the ones listening to everything
+        # ("*"), and for each event name that has listeners of its own, those interleaved with
+        # the "*" ones, so that an event only has to go through the listeners it's meant for.
+        self._wildcard_listeners: List[Tuple[str, Callable[[Event], bool]]] = []
+        self._listeners: Dict[str, List[Tuple[str, Callable[[Event], bool]]]] = {}
+        # whether any of the above are non-empty
+        self._has_listeners = False
 
     def _add_event_listener(self, name: str, listener: Callable[[Event], bool]) -> None:
-        self._listeners.append((name, listener))
+        name = sys.intern(name)
+        entry = (name, listener)
+        if name == "*":
+            self._wildcard_listeners.append(entry)
+            for listeners in self._listeners.values():
+                listeners.append(entry)
+        else:
+            # (a new list starts with the "*" listeners, which were all added before this one)
+            self._listeners.setdefault(name, list(self._wildcard_listeners)).append(entry)
+        self._has_listeners = True
 
     def _remove_event_listener(self, name: str, listener: Callable[[Event], bool]) -> None:
-        self._listeners.remove((name, listener))
+        entry = (name, listener)
+        try:
+            if name == "*":
+                self._wildcard_listeners.remove(entry)
+                for listeners in self._listeners.values():
+                    listeners.remove(entry)
+            else:
+                self._listeners.get(name, []).remove(entry)
+        except ValueError:
+            raise ValueError("listener was not added for {0}".format(name)) from None
+        # (without any "*" listeners, the per-event lists only hold their own)
+        self._has_listeners = bool(self._wildcard_listeners) or any(self._listeners.values())
 
     def _handle_device_event(self, line) -> bool:
-        for name, prop in self._event_members:
-            event_obj = prop.fmatch(self, line)
-            if event_obj:
-                event_obj.name = name
-                event_obj.source = self
-                for listener_event_name, listener in self._listeners:
-                    if listener_event_name in ("*", name):
-                        # if the function returns something truthy, stop processing
-                        if listener(event_obj):
-                            return True
+        dispatch = self._event_dispatch_by_prefix.get(line[:1], self._unprefixed_event_dispatch)
+        found = dispatch.find(self, line)
+        if found is None:
+            return False
+
+        name, event_obj = found
+        listeners = self._listeners.get(name, self._wildcard_listeners)
+        if not listeners:
+            return True
+
+        if event_obj is _NULL_EVENT:
+            event_obj = Event(name, self)
+        else:
+            event_obj.name = name
+            event_obj.source = self
+        # Listeners may add or remove listeners, so go through a snapshot, but skip any that
+        # an earlier listener has since removed.
+        for entry in tuple(listeners):
+            # if the function returns something truthy, stop processing
+            if entry in listeners and entry[1](event_obj):
                 return True
-        return False
+        return True
+
+    def data_received(self, data: bytes) -> None:
+        """Buffer received data, and call handle_line for each complete line."""
+        # Packetizer searches and re-splits the whole buffer once per line; split it just once.
+        self.buffer.extend(data)
+        if self.TERMINATOR in self.buffer:
+            *packets, self.buffer = self.buffer.split(self.TERMINATOR)
+            for packet in packets:
+                self.handle_line(packet.decode(self.ENCODING, self.UNICODE_HANDLING))
 
     def handle_line(self, line: str) -> None:
         """Handler method for serial.threaded.LineReader."""
-        logger.debug("<-- %s", line)
-        if self._waiting_for_response:
-            if line.startswith("E"):
-                self._response_exception = exception_from_error_code(line)
-            self._response = line
-            self._line_handler_event.set()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("<-- %s", line)
+        if self._request_lock.locked():
+            exc = exception_from_error_code(line) if _ERROR_RE.match(line) else None
+            self._response_queue.put((line, exc))
+        elif not self._has_listeners:
+            # nobody to tell, so don't bother working out which event this is
+            return
         elif self._handle_device_event(line):
             return
         else:
             logger.debug("got unexpected line %s", line)
 
-    def _handle_possible_exception_from_thread(self) -> None:
-        if self._response_exception is not None:
-            # pylint: disable=raising-bad-type
-            exception_from_thread = self._response_exception
-            self._response_exception = None
-            raise exception_from_thread
-
-    def make_request(self, request: str, timeout=1.0) -> str:
-        logger.debug("--> %s", request)
-        self._waiting_for_response = True
+    def make_request(self, request: str, timeout=1.0) -> Optional[str]:
+        with self._request_lock:
+            # Throw away anything left over from an earlier request that timed out, so
+            # that a late response isn't mistaken for the answer to this one.
+            while not self._response_queue.empty():
+                self._response_queue.get_nowait()
 
-        # Can't use write_line, because we want to send without TERMINATOR.
-        self.transport.write(request.encode(self.ENCODING, self.UNICODE_HANDLING))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("--> %s", request)
+            # Can't use write_line, because we want to send without TERMINATOR.
+            self.transport.write(request.encode(self.ENCODING, self.UNICODE_HANDLING))
 
-        self._line_handler_event.wait(timeout)
-        self._line_handler_event.clear()
-        self._waiting_for_response = False
+            try:
+                response, exc = self._response_queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
 
-        self._handle_possible_exception_from_thread()
-        return self._response
+        if exc is not None:
+            raise exc
+        return response
 
 
 class ExtronProtocol(_ExtronProtocol):
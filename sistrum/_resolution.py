@@ -1,9 +1,11 @@
 from decimal import Decimal
 from fractions import Fraction
-from functools import total_ordering
+import functools
 import math
 import numbers
 import re
+from typing import Tuple
+import weakref
 
 
 __all__ = ["AspectRatio", "Resolution"]
@@ -35,50 +37,52 @@ class AspectRatio(Fraction):
         a numerator/height pair, or a float.
         """
 
-        self = super(AspectRatio, cls).__new__(cls)
-
         if denominator is None:
+            # Already in lowest terms in all of these cases, so no need for the gcd.
             if isinstance(numerator, int):
-                denominator = 1
-                return self
+                return cls._from_ints(numerator, 1)
 
             elif isinstance(numerator, numbers.Rational):
-                numerator = numerator.numerator
-                denominator = numerator.denominator
-                return self
+                return cls._from_ints(numerator.numerator, numerator.denominator)
 
             elif isinstance(numerator, (float, Decimal)):
-                numerator, denominator = numerator.as_integer_ratio()
-                return self
+                return cls._from_ints(*numerator.as_integer_ratio())
 
             elif isinstance(numerator, str):
-                match = _ASPECT_FORMAT.match(numerator)
-                if match is None:
-                    raise ValueError("Invalid literal for AspectRatio: %r" % numerator)
-                numerator = int(match.group(1))
-                denominator = int(match.group(2))
+                return cls._from_str(numerator)
 
             else:
                 raise TypeError("argument should be a string or Rational")
 
-        elif isinstance(numerator, int) and isinstance(denominator, int):
-            pass
+        elif not (isinstance(numerator, int) and isinstance(denominator, int)):
+            raise TypeError("both arguments should be ints")
 
         if denominator == 0:
             raise ZeroDivisionError("AspectRatio(%s, 0)" % numerator)
 
         gcd = math.gcd(numerator, denominator)
-        numerator //= gcd
-        denominator //= gcd
+        return cls._from_ints(numerator // gcd, denominator // gcd)
+
+    @classmethod
+    def _from_ints(cls, numerator: int, denominator: int) -> "AspectRatio":
+        self = super(AspectRatio, cls).__new__(cls)
         self._numerator = numerator
         self._denominator = denominator
         return self
 
+    # Devices only ever report a handful of these, so parse each one once.
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def _from_str(cls, string: str) -> "AspectRatio":
+        match = _ASPECT_FORMAT.match(string)
+        if match is None:
+            raise ValueError("Invalid literal for AspectRatio: %r" % string)
+        return cls(int(match.group(1)), int(match.group(2)))
+
     def __str__(self):
         return "%s:%s" % (self._numerator, self._denominator)
 
 
-@total_ordering
 class Resolution:
     """
     Represents a resolution.
@@ -90,26 +94,30 @@ class Resolution:
     another Resolution instance, or a width/height pair with additional optional flags.
     """
 
-    __slots__ = ("_width", "_height", "_interlaced", "_cvt", "_sharp")
+    __slots__ = ("_width", "_height", "_interlaced", "_cvt", "_sharp", "_key", "_hash", "__weakref__")
 
     _width: int
     _height: int
     _interlaced: bool
     _cvt: bool
     _sharp: bool
+    # all of the above, as a tuple for comparisons, and its hash
+    _key: Tuple[int, int, bool, bool, bool]
+    _hash: int
+
+    # Resolutions are immutable, so there's only ever one instance for each key; equal
+    # resolutions are then usually the same object, and comparisons short-circuit on identity.
+    # (Held weakly, so that resolutions nobody uses any more don't pile up.)
+    _interned: "weakref.WeakValueDictionary[Tuple[int, int, bool, bool, bool], Resolution]" = (
+        weakref.WeakValueDictionary()
+    )
 
     # We're immutable, so use __new__ not __init__
     def __new__(cls, width, height=None, interlaced=False, cvt=False, sharp=False):
-        self = super().__new__(cls)
-
         if height is None:
             if isinstance(width, Resolution):
-                # copy-construction
-                self._width = width._width
-                self._height = width._height
-                self._interlaced = width._interlaced
-                self._cvt = width._cvt
-                self._sharp = width._sharp
+                # copy-construction; we're immutable, so the original will do
+                return width
 
             elif isinstance(width, str):
                 # construction from string
@@ -117,54 +125,36 @@ class Resolution:
 
             else:
                 raise TypeError("argument should be a string")
-        else:
-            self._width = width
-            self._height = height
-            self._interlaced = interlaced
-            self._cvt = cvt
-            self._sharp = sharp
 
+        # (normalized, so that equal resolutions share an instance whatever types they came in as)
+        key = (int(width), int(height), bool(interlaced), bool(cvt), bool(sharp))
+        self = cls._interned.get(key)
+        if self is None:
+            self = super().__new__(cls)
+            self._width, self._height, self._interlaced, self._cvt, self._sharp = key
+            self._key = key
+            self._hash = hash(key)
+            # (if another thread got here first, use its instance)
+            self = cls._interned.setdefault(key, self)
         return self
 
-    _SMPTE_RESOLUTIONS = [
+    _SMPTE_RESOLUTIONS_ORDER = (
         (720, 480),  # 480p
         (720, 576),  # 576p
         (1280, 720),  # 720p
         (1920, 1080),  # 1080p/1080i
-    ]
+    )
+    _SMPTE_RESOLUTIONS_SET = frozenset(_SMPTE_RESOLUTIONS_ORDER)
 
     def _is_smpte_resolution(self) -> bool:
-        return (self._width, self._height) in self._SMPTE_RESOLUTIONS
+        return (self._width, self._height) in self._SMPTE_RESOLUTIONS_SET
 
     @classmethod
     def fromstring(cls, string: str):
-        match = _SMPTE_RESOLUTION_FORMAT.match(string)
-        if match:
-            for smpte_res in cls._SMPTE_RESOLUTIONS:
-                if smpte_res[1] == int(match[1]):
-                    interlaced = match[2] == "i"
-                    sharp = match[3] == " Sharp"
-                    cvt = match[3] == " CVT"
-                    return Resolution(smpte_res[0], smpte_res[1], interlaced=interlaced, cvt=cvt, sharp=sharp)
-
-        match = _RESOLUTION_FORMAT.match(string)
-        if match:
-            return Resolution(int(match[1]), int(match[2]))
-
-        raise ValueError("Unable to parse resolution string: {0}".format(str))
+        return Resolution(*_parse_resolution(string))
 
     def __str__(self):
-        if self._is_smpte_resolution():
-            base = "{0}{1}".format(self.height, "i" if self.interlaced else "p")
-        else:
-            base = "{0}x{1}".format(self.width, self.height)
-
-        if self.cvt:
-            return "{0} CVT".format(base)
-        elif self.sharp:
-            return "{0} Sharp".format(base)
-        else:
-            return base
+        return _format_resolution(self._width, self._height, self._interlaced, self._cvt, self._sharp)
 
     def __repr__(self):
         return 'Resolution("{0}")'.format(self.__str__())
@@ -199,14 +189,71 @@ class Resolution:
 
         return AspectRatio(self._width, self._height)
 
-    def _attrtuple(self):
-        return (self._width, self._height, self._interlaced, self._cvt, self._sharp)
-
     def __eq__(self, other):
-        return self._attrtuple() == other._attrtuple()
+        if not isinstance(other, Resolution):
+            return NotImplemented
+        return self._key == other._key
+
+    def __ne__(self, other):
+        if not isinstance(other, Resolution):
+            return NotImplemented
+        return self._key != other._key
 
     def __lt__(self, other):
-        return self._attrtuple() < other._attrtuple()
+        if not isinstance(other, Resolution):
+            return NotImplemented
+        return self._key < other._key
+
+    def __le__(self, other):
+        if not isinstance(other, Resolution):
+            return NotImplemented
+        return self._key <= other._key
+
+    def __gt__(self, other):
+        if not isinstance(other, Resolution):
+            return NotImplemented
+        return self._key > other._key
+
+    def __ge__(self, other):
+        if not isinstance(other, Resolution):
+            return NotImplemented
+        return self._key >= other._key
 
     def __hash__(self):
-        return self._attrtuple().__hash__()
+        return self._hash
+
+
+# Devices only use a couple of dozen resolutions, so remember how each one is parsed...
+@functools.lru_cache(maxsize=256)
+def _parse_resolution(string: str) -> Tuple[int, int, bool, bool, bool]:
+    """Parse a resolution string into (width, height, interlaced, cvt, sharp)."""
+    match = _SMPTE_RESOLUTION_FORMAT.match(string)
+    if match:
+        for smpte_res in Resolution._SMPTE_RESOLUTIONS_ORDER:
+            if smpte_res[1] == int(match[1]):
+                interlaced = match[2] == "i"
+                sharp = match[3] == " Sharp"
+                cvt = match[3] == " CVT"
+                return (smpte_res[0], smpte_res[1], interlaced, cvt, sharp)
+
+    match = _RESOLUTION_FORMAT.match(string)
+    if match:
+        return (int(match[1]), int(match[2]), False, False, False)
+
+    raise ValueError("Unable to parse resolution string: {0}".format(string))
+
+
+# ...and, since they're immutable, how each one is written out.
+@functools.lru_cache(maxsize=256)
+def _format_resolution(width: int, height: int, interlaced: bool, cvt: bool, sharp: bool) -> str:
+    if (width, height) in Resolution._SMPTE_RESOLUTIONS_SET:
+        base = "{0}{1}".format(height, "i" if interlaced else "p")
+    else:
+        base = "{0}x{1}".format(width, height)
+
+    if cvt:
+        return "{0} CVT".format(base)
+    elif sharp:
+        return "{0} Sharp".format(base)
+    else:
+        return base
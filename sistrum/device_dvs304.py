@@ -17,9 +17,9 @@ More information is available in the `user manual`_.
 .. _user manual: https://media.extron.com/public/download/files/userman/DVS_304_Series_68-1039-01_G.pdf
 """
 
-import math
-from typing import Mapping, Optional, Tuple
+from typing import Mapping, NamedTuple, Optional, Tuple
 import re
+import types
 from sistrum._protocol import ExtronProtocol
 from sistrum._enums import TestPattern, InputVideoFormat, InputStandard
 from sistrum._resolution import Resolution
@@ -28,7 +28,7 @@ from sistrum._event import (
     EnumValueConverter,
     generic_event_property,
 )
-from sistrum.exceptions import InvalidParameterError  # pylint: disable=no-name-in-module
+from sistrum.exceptions import InvalidParameterError
 
 
 __all__ = ["ExtronDVS304Protocol", "Status"]
@@ -103,9 +103,36 @@ _OUTPUT_REFRESH_RATE = EnumValueConverter(
 )
 
 
-class OutputRateConverter(ValueConverter):
-    _MATCHER = re.compile(r"(\d+)\*(\d+)")
+def _output_rate_tables():
+    """\
+    Build the (Resolution, refresh) <-> "RR*FF" mappings for every pairing of an output
+    resolution with a refresh rate, since there are only a couple hundred of them.
+
+    This is the full cross product, as the converters accepted before, not just the modes
+    the device actually supports; the device rejects the rest itself.
+    """
+    to_raw = {}
+    to_api = {}
+    for resolution_raw, resolution in _OUTPUT_RESOLUTION.mapping.items():
+        for refresh_raw, nominal_refresh in _OUTPUT_REFRESH_RATE.mapping.items():
+            raw = "{0:02d}*{1:02d}".format(int(resolution_raw), int(refresh_raw))
+            refresh = nominal_refresh
+            # The "72 Hz" mode isn't always 72 Hz, annoyingly.
+            if refresh_raw == "3":
+                if resolution.width == 1440 and resolution.height == 900:
+                    refresh = 75.0
+                elif resolution.width == 1920 and resolution.height == 1080:
+                    refresh = 24.0
+            to_raw[(resolution, nominal_refresh)] = raw
+            to_raw[(resolution, refresh)] = raw
+            to_api[(int(resolution_raw), int(refresh_raw))] = (resolution, refresh)
+    return to_raw, to_api
 
+
+_OUTPUT_RATE_TO_RAW, _OUTPUT_RATE_TO_API = _output_rate_tables()
+
+
+class OutputRateConverter(ValueConverter):
     def __init__(self):
         self.prim_type = Tuple[Resolution, float]
 
@@ -113,38 +140,17 @@ class OutputRateConverter(ValueConverter):
         (resolution, refresh) = obj
 
         try:
-            resolution_raw = _OUTPUT_RESOLUTION.to_raw(resolution)
-        except ValueError as value_error:
-            raise InvalidParameterError() from value_error
-
-        # the '3' case is weird...
-        if resolution.width == 1440 and resolution.height == 900 and math.isclose(refresh, 75.0):
-            refresh_raw = "3"
-        elif resolution.width == 1920 and resolution.height == 1080 and math.isclose(refresh, 24.0):
-            refresh_raw = "3"
-        else:
-            try:
-                refresh_raw = _OUTPUT_REFRESH_RATE.to_raw(refresh)
-            except ValueError as value_error:
-                raise InvalidParameterError() from value_error
-
-        return "{0:02d}*{1:02d}".format(int(resolution_raw), int(refresh_raw))
+            return _OUTPUT_RATE_TO_RAW[(resolution, round(refresh, 2))]
+        except (KeyError, TypeError) as lookup_error:
+            raise InvalidParameterError() from lookup_error
 
     def to_api(self, obj: str) -> Tuple[Resolution, float]:
-        match = self._MATCHER.match(obj)
-        if match:
-            resolution_raw = int(match[1])
-            refresh_raw = int(match[2])
-
-            resolution = _OUTPUT_RESOLUTION.to_api(str(resolution_raw))
-            refresh = _OUTPUT_REFRESH_RATE.to_api(str(refresh_raw))
-            # The "72 Hz" mode isn't always 72 Hz, annoyingly.
-            if refresh_raw == 3:
-                if resolution.width == 1440 and resolution.height == 900:
-                    refresh = 75.0
-                elif resolution.width == 1920 and resolution.height == 1080:
-                    refresh = 24.0
-            return (resolution, refresh)
+        resolution_raw, sep, refresh_raw = obj.partition("*")
+        if sep:
+            try:
+                return _OUTPUT_RATE_TO_API[(int(resolution_raw), int(refresh_raw))]
+            except (KeyError, ValueError):
+                pass
         raise ValueError("unable to match {0}".format(obj))
 
 
@@ -161,53 +167,37 @@ _TEST_PATTERN = EnumValueConverter(
 )
 
 
-class Status:
+class Status(NamedTuple):
+    #: selected video input
     video_input: int
+    #: selected audio input
     audio_input: int
+    #: input format of selected input
     input_format: InputVideoFormat
+    #: input standard
     input_standard: InputStandard
+    #: memory presets (indexed 1 through 3)
     preset: Mapping[int, InputStandard]
+    #: current SDI input selection (if applicable)
     sdi_input: Optional[int]
 
-    __slots__ = ("video_input", "audio_input", "input_format", "input_standard", "preset", "sdi_input")
-
-    def __init__(
-        self,
-        video_input: int,
-        audio_input: int,
-        input_format: InputVideoFormat,
-        input_standard: InputStandard,
-        preset: Mapping[int, InputStandard],
-        sdi_input: Optional[int],
-    ):
-        #: selected video input
-        self.video_input = video_input
-        #: selected audio input
-        self.audio_input = audio_input
-        #: input format of selected input
-        self.input_format = input_format
-        #: input standard
-        self.input_standard = input_standard
-        #: memory presets (indexed 1 through 3)
-        self.preset = preset
-        #: current SDI input selection (if applicable)
-        self.sdi_input = sdi_input
+
+_STATUS_RE = re.compile(r"^Vid([\d\-]) Aud([\d\-]) Typ(\d) Std([\d\-]) Pre(\d)(\d)(\d)(| Sdi(\d))$")
 
 
 def _parse_status(line):
-    pattern = re.compile(r"^Vid([\d\-]) Aud([\d\-]) Typ(\d) Std([\d\-]) Pre(\d)(\d)(\d)(| Sdi(\d))$")
-    match = pattern.match(line)
+    match = _STATUS_RE.match(line)
 
     video_input = 0 if match[1] == "-" else int(match[1])
     audio_input = 0 if match[2] == "-" else int(match[2])
     input_format = _INPUT_VIDEO_FORMAT.to_api(match[3])
     input_standard = _INPUT_STANDARD.to_api(match[4])
-    preset = dict(
-        [
-            (1, _INPUT_STANDARD.to_api(match[5])),
-            (2, _INPUT_STANDARD.to_api(match[6])),
-            (3, _INPUT_STANDARD.to_api(match[7])),
-        ]
+    preset = types.MappingProxyType(
+        {
+            1: _INPUT_STANDARD.to_api(match[5]),
+            2: _INPUT_STANDARD.to_api(match[6]),
+            3: _INPUT_STANDARD.to_api(match[7]),
+        }
     )
     if match[9] is None:
         sdi_input = None
@@ -218,7 +208,6 @@ def _parse_status(line):
 
 
 class ExtronDVS304Protocol(ExtronProtocol):
-
     input = generic_event_property(
         """\
         Selected video and audio input, from 1 to 4.
@@ -23,7 +23,9 @@ More information is available in the `user manual`_.
 """
 
 import re
-from typing import Mapping, Union
+import time
+import types
+from typing import Mapping, NamedTuple, Optional, Union
 
 from sistrum._protocol import ExtronProtocol
 from sistrum._enums import ExecutiveMode, SwitcherMode
@@ -40,56 +42,40 @@ _EXECUTIVE_MODE = EnumValueConverter(
     }
 )
 
-_SWITCHER_MODE = EnumValueConverter(
-    {
-        "1": SwitcherMode.SINGLE,
-        "2": SwitcherMode.SEPARATE,
-    }
-)
+_SWITCHER_MODE_MAP = {
+    "1": SwitcherMode.SINGLE,
+    "2": SwitcherMode.SEPARATE,
+}
+
+_SWITCHER_MODE = EnumValueConverter(_SWITCHER_MODE_MAP)
 
 
-class Status:
+class Status(NamedTuple):
+    #: switcher mode
     mode: SwitcherMode
+    #: current input per input group
     input: Mapping[int, int]
+    #: source group for program audio
     audio_group: int
+    #: program audio input within group
     audio_input: int
 
-    __slots__ = ("mode", "input", "audio_group", "audio_input")
-
-    def __init__(
-        self,
-        mode: SwitcherMode,
-        input: Mapping[int, int],  # pylint: disable=redefined-builtin
-        audio_group: int,
-        audio_input: int,
-    ):
-        #: switcher mode
-        self.mode = mode
-        #: current input per input group
-        self.input = input
-        #: source group for program audio
-        self.audio_group = audio_group
-        #: program audio input within group
-        self.audio_input = audio_input
 
+# How long a status response is reused for. Reading ``input``, then indexing it, would otherwise
+# query the status for each step.
+_STATUS_CACHE_TTL = 0.05
+
+_STATUS_RE = re.compile(r"^Mod(\d) 1G(\d) 2G(\d) 3G(\d) 4G=(\d)G(\d)$")
 
-def _parse_status(line):
-    pattern = re.compile(r"^Mod(\d) 1G(\d) 2G(\d) 3G(\d) 4G=(\d)G(\d)$")
-    match = pattern.match(line)
 
-    mode = _SWITCHER_MODE.to_api(match[1])
+def _parse_status(line):
+    mode, input1, input2, input3, audio_group, audio_input = _STATUS_RE.match(line).groups()
 
     return Status(
-        mode=mode,
-        input=dict(
-            [
-                (1, int(match[2])),
-                (2, int(match[3])),
-                (3, int(match[4])),
-            ]
-        ),
-        audio_group=int(match[5]),
-        audio_input=int(match[6]),
+        mode=_SWITCHER_MODE_MAP[mode],
+        input=types.MappingProxyType({1: int(input1), 2: int(input2), 3: int(input3)}),
+        audio_group=int(audio_group),
+        audio_input=int(audio_input),
     )
 
 
@@ -102,12 +88,20 @@ def _separate_to_single_input(group: int, index: int) -> int:
 
 def _mic_volume_property_fset(self, value):
     if value >= 0:
-        self.make_request("16*{0}G".format(value))
+        self.make_request(f"16*{value}G")
     else:
-        self.make_request("16*{0}g".format(-value))
+        self.make_request(f"16*{-value}g")
 
 
-class _SwitchInputProperty(int, _ArrayEventProperty):  # pylint: disable=too-many-ancestors
+def _switch_input_getitem(self, group_number) -> int:
+    return self.status.input[group_number]
+
+
+def _switch_input_setitem(self, group_number, value) -> None:
+    self.make_request(f"{group_number}*{value}!")
+
+
+class _SwitchInputProperty(int, _ArrayEventProperty):
     """\
     Integer proxy class to handle mixed single-switcher/separate-switcher syntax
     for ExtronMPS112Protocol.input.
@@ -137,17 +131,13 @@ class _SwitchInputProperty(int, _ArrayEventProperty):  # pylint: disable=too-man
             raise ValueError("Not sure how to work with {0}".format(parent.__class__.__name__))
 
     def __init__(self, parent):
-        def getitem(self, group_number) -> int:
-            return self.status.input[group_number]
-
-        def setitem(self, group_number, value) -> None:
-            self.make_request("{0}*{1}!".format(group_number, value))
-
-        super().__init__(parent=parent, indices=range(1, 4), fgetitem=getitem, fsetitem=setitem)
+        super().__init__(
+            parent=parent, indices=range(1, 4), fgetitem=_switch_input_getitem, fsetitem=_switch_input_setitem
+        )
 
     def __copy__(self) -> Mapping[int, int]:
         # TODO: this makes copy.copy() work, but we lose the "works as an integer"
-        return {k: v for k, v in self.items()}  # pylint: disable=unnecessary-comprehension
+        return {k: v for k, v in self.items()}
 
 
 def _input_fget(self) -> Union[int, Mapping[int, int]]:
@@ -155,7 +145,7 @@ def _input_fget(self) -> Union[int, Mapping[int, int]]:
 
 
 def _input_fset(self, value) -> None:
-    self.make_request("{0}!".format(value))
+    self.make_request(f"{value}!")
 
 
 class ExtronMPS112Protocol(ExtronProtocol):
@@ -164,10 +154,37 @@ class ExtronMPS112Protocol(ExtronProtocol):
     in the `user manual`_.
     """
 
+    def __init__(self):
+        super().__init__()
+        self._cached_status: Optional[Status] = None
+        self._cached_status_time = 0.0
+
+    def make_request(self, request: str, timeout=1.0) -> Optional[str]:
+        # anything other than a status query might change the status (and a status query
+        # can run while this one waits, so forget whatever that found, too)
+        self._cached_status = None
+        try:
+            return super().make_request(request, timeout)
+        finally:
+            self._cached_status = None
+
+    def handle_line(self, line: str) -> None:
+        # a line the switcher sends by itself (e.g. when an input is changed from the front
+        # panel) means the status may have changed, too
+        if not self._request_lock.locked():
+            self._cached_status = None
+        super().handle_line(line)
+
     @property
     def status(self) -> Status:
         """Retrieve the current status of the switcher."""
-        return _parse_status(self.make_request("I"))
+        now = time.monotonic()
+        status = self._cached_status
+        if status is None or now - self._cached_status_time >= _STATUS_CACHE_TTL:
+            status = _parse_status(super().make_request("I"))
+            self._cached_status = status
+            self._cached_status_time = now
+        return status
 
     input = generic_event_property(
         """\
@@ -1,109 +1,121 @@
+from typing import Any
+
+
 class SISError(Exception):
-    def __init__(self, code, desc):
+    # Subclasses for specific errors set these, and are then constructed with no arguments.
+    code: Any = None
+    desc: str = ""
+
+    def __init__(self, code=None, desc=None):
+        if code is None:
+            code = self.code
+        if desc is None:
+            desc = self.desc
         super().__init__(desc)
         self.code = code
 
 
 class InvalidInputNumberError(SISError):
-    def __init__(self):
-        super().__init__(1, "Invalid input number")
+    code = 1
+    desc = "Invalid input number"
 
 
 class InvalidSwitchAttemptError(SISError):
-    def __init__(self):
-        super().__init__(6, "Invalid switch attempt in this mode")
+    code = 6
+    desc = "Invalid switch attempt in this mode"
 
 
 class InvalidFunctionNumberError(SISError):
-    def __init__(self):
-        super().__init__(9, "Invalid function number")
+    code = 9
+    desc = "Invalid function number"
 
 
 class InvalidCommandError(SISError):
-    def __init__(self):
-        super().__init__(10, "Invalid command")
+    code = 10
+    desc = "Invalid command"
 
 
 class InvalidPresetNumberError(SISError):
-    def __init__(self):
-        super().__init__(11, "Invalid preset number")
+    code = 11
+    desc = "Invalid preset number"
 
 
 class InvalidPortNumberError(SISError):
-    def __init__(self):
-        super().__init__(12, "Invalid port number")
+    code = 12
+    desc = "Invalid port number"
 
 
 class InvalidParameterError(SISError):
-    def __init__(self):
-        super().__init__(13, "Invalid parameter")
+    code = 13
+    desc = "Invalid parameter"
 
 
 class InvalidConfigurationError(SISError):
-    def __init__(self):
-        super().__init__(14, "Not valid for this configuration")
+    code = 14
+    desc = "Not valid for this configuration"
 
 
 class InvalidCommandForSignalTypeError(SISError):
-    def __init__(self):
-        super().__init__(17, "Invalid command for signal type")
+    code = 17
+    desc = "Invalid command for signal type"
 
 
 class BusyError(SISError):
-    def __init__(self):
-        super().__init__(22, "Busy")
+    code = 22
+    desc = "Busy"
 
 
 class PrivilegeViolationError(SISError):
-    def __init__(self):
-        super().__init__(24, "Privilege violation")
+    code = 24
+    desc = "Privilege violation"
 
 
 class DeviceNotPresentError(SISError):
-    def __init__(self):
-        super().__init__(25, "Device not present")
+    code = 25
+    desc = "Device not present"
 
 
 class MaximumNumberOfConnectionsExceededError(SISError):
-    def __init__(self):
-        super().__init__(26, "Maximum number of connections exceeded")
+    code = 26
+    desc = "Maximum number of connections exceeded"
 
 
 class InvalidEventNumberError(SISError):
-    def __init__(self):
-        super().__init__(27, "Invalid event number")
+    code = 27
+    desc = "Invalid event number"
 
 
 class BadFileNameError(SISError):
-    def __init__(self):
-        super().__init__(28, "Bad filename/File not found")
+    code = 28
+    desc = "Bad filename/File not found"
 
 
 # E30 is supposedly followed with "colon and a descriptor number"
 class HardwareFailureError(SISError):
-    def __init__(self):
-        super().__init__(30, "Hardware failure")
+    code = 30
+    desc = "Hardware failure"
 
 
 class AttemptToBreakPortPassthroughError(SISError):
-    def __init__(self):
-        super().__init__(31, "Attempt to break port passthrough when not set")
+    code = 31
+    desc = "Attempt to break port passthrough when not set"
 
 
 class IncorrectVChipPasswordError(SISError):
-    def __init__(self):
-        super().__init__(32, "Incorrect V-chip password")
+    code = 32
+    desc = "Incorrect V-chip password"
 
 
 class BadFileTypeForLogoError(SISError):
-    def __init__(self):
-        super().__init__(33, "Bad file type for logo")
+    code = 33
+    desc = "Bad file type for logo"
 
 
-# Create an exception class mapping for each error code.
+# Create an exception class mapping for each error code. Devices send the code as two
+# digits, e.g. "E01"; also accept it without the leading zero.
 _codes_to_exception_classes = {}
 
-for _exc_cls in [
+for _exc_cls in (
     InvalidInputNumberError,
     InvalidSwitchAttemptError,
     InvalidFunctionNumberError,
@@ -123,9 +135,9 @@ for _exc_cls in [
     AttemptToBreakPortPassthroughError,
     IncorrectVChipPasswordError,
     BadFileTypeForLogoError,
-]:
-    exc_cls_obj = _exc_cls()
-    _codes_to_exception_classes["E{0}".format(exc_cls_obj.code)] = _exc_cls
+):
+    _codes_to_exception_classes[f"E{_exc_cls.code}"] = _exc_cls
+    _codes_to_exception_classes[f"E{_exc_cls.code:02d}"] = _exc_cls
 
 
 def exception_from_error_code(code: str) -> SISError:
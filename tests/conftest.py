@@ -1,7 +1,12 @@
-import pytest  # type: ignore
 import serial  # type: ignore
 
+from tests.protocol_simdev import simulator_classes
+from tests.simulators import SimulatedDVS304, SimulatedMPS112
 
-@pytest.fixture(scope="module", autouse=True)
-def pyserial_registrar():
-    serial.protocol_handler_packages.append("tests")
+
+def pytest_configure(config):
+    # This runs once per process (so once in each pytest-xdist worker, too) before any tests
+    # are collected, and nothing changes these afterwards, so the workers don't share any state.
+    if "tests" not in serial.protocol_handler_packages:
+        serial.protocol_handler_packages.append("tests")
+    simulator_classes.update(dvs304=SimulatedDVS304, mps112=SimulatedMPS112)
@@ -11,28 +11,41 @@
 #   mean that command processing ends up being synchronized, but that's
 #   sufficient for test purposes.
 
-import logging
-import serial  # type: ignore
 from serial.urlhandler.protocol_loop import LOGGER_LEVELS  # type: ignore
 from serial.urlhandler.protocol_loop import Serial as LoopSerial
 from serial.serialutil import SerialBase, SerialException, PortNotOpenError
 import urllib.parse as urlparse
+import functools
+import inspect
+import logging
+import queue
 import re
 from sistrum.exceptions import SISError
-import inspect
 import time
 from typing import Dict
 
 
+@functools.lru_cache(maxsize=None)
+def _split_url(url):
+    """Split a simdev:// URL, also returning the equivalent loop:// URL."""
+    parts = urlparse.urlsplit(url)
+    return parts, urlparse.urlunsplit(("loop",) + tuple(parts[1:]))
+
+
 class Serial(SerialBase):
     def __init__(self, *args, **kwargs):
-        self.local_loopback = LoopSerial(*args, **kwargs)
-        self.remote_loopback = LoopSerial(*args, **kwargs)
+        # The loopbacks are created when we're opened; until then, SerialBase holds the settings.
+        self.local_loopback = None
+        self.remote_loopback = None
         self.is_open = False
         self._real_port = None
+        # the rest of a queued response that a read() didn't ask for (see dut_write)
+        self._pending = bytearray()
         super(Serial, self).__init__(*args, **kwargs)
 
     def open(self):
+        self.local_loopback = LoopSerial(baudrate=self._baudrate, timeout=self._timeout)
+        self.remote_loopback = LoopSerial(baudrate=self._baudrate, timeout=self._timeout)
         self.from_url(self._real_port)
 
         self.local_loopback.open()
@@ -45,7 +58,7 @@ class Serial(SerialBase):
         self.is_open = False
 
     def from_url(self, url):
-        parts = urlparse.urlsplit(url)
+        parts, loop_url = _split_url(url)
         if parts.scheme != "simdev":
             raise SerialException(
                 "expected a string in the form "
@@ -70,13 +83,14 @@ class Serial(SerialBase):
         devclass = simulator_classes[parts.hostname]
         self.simdev = devclass(self)
 
-        reconstructed_url = urlparse.urlunsplit(("loop", parts[1], parts[2], parts[3], parts[4]))
-        self.local_loopback.from_url(reconstructed_url)
-        self.remote_loopback.from_url(reconstructed_url)
+        # (the loopbacks apply the URL themselves when they're opened)
+        self.local_loopback.port = loop_url
+        self.remote_loopback.port = loop_url
 
     def _reconfigure_port(self):
-        self.local_loopback._reconfigure_port()
-        self.remote_loopback._reconfigure_port()
+        for loopback in (self.local_loopback, self.remote_loopback):
+            loopback.baudrate = self._baudrate
+            loopback.timeout = self._timeout
 
     @property
     def port(self):
@@ -85,30 +99,6 @@ class Serial(SerialBase):
     @port.setter
     def port(self, port):
         self._real_port = port
-        if port:
-            parts = urlparse.urlsplit(port)
-            port = urlparse.urlunsplit(("loop", parts[1], parts[2], parts[3], parts[4]))
-
-        self.local_loopback.port = port
-        self.remote_loopback.port = port
-
-    @property
-    def baudrate(self, baudrate):
-        return self.local_looback.baudrate
-
-    @baudrate.setter
-    def baudrate(self, baudrate):
-        self.local_loopback.baudrate = baudrate
-        self.remote_loopback.baudrate = baudrate
-
-    @property
-    def timeout(self):
-        return self.local_loopback.timeout
-
-    @timeout.setter
-    def timeout(self, timeout):
-        self.local_loopback.timeout = timeout
-        self.remote_loopback.timeout = timeout
 
     # -----------------------------------------------------------------------
     # This is the "normal pyserial client" side.
@@ -116,16 +106,27 @@ class Serial(SerialBase):
 
     @property
     def in_waiting(self):
-        return self.local_loopback.in_waiting
+        # the loopback counts queue items, but ours are whole responses; count bytes
+        return len(self._pending) + sum(len(item) for item in list(self.local_loopback.queue.queue) if item)
 
     def read(self, size=1):
-        return self.local_loopback.read(size)
+        # Like the loopback's read(), but a queue item can hold more than was asked for, so
+        # only take as many bytes as that, and keep the rest for the next read.
+        while len(self._pending) < size:
+            item = self.local_loopback.read(1)
+            if not item:
+                break
+            self._pending += item
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
 
     def cancel_read(self):
         self.local_loopback.cancel_read()
 
     def reset_input_buffer(self):
-        self.local_looback.reset_input_buffer()
+        self._pending.clear()
+        self.local_loopback.reset_input_buffer()
 
     @property
     def out_waiting(self):
@@ -173,6 +174,23 @@ class Serial(SerialBase):
     def dut_read(self, size=1):
         return self.remote_loopback.read(size)
 
+    def dut_drain(self):
+        """Read everything the client has written so far, without blocking."""
+        # Take the loopback's queued bytes directly, rather than asking how many there
+        # are and then reading them back one at a time.
+        pending = self.remote_loopback.queue
+        data = bytearray()
+        while True:
+            try:
+                byte = pending.get_nowait()
+            except queue.Empty:
+                break
+            if byte is None:
+                # the loopback was closed
+                break
+            data += byte
+        return bytes(data)
+
     def dut_cancel_read(self):
         self.remote_loopback.cancel_read()
 
@@ -184,7 +202,16 @@ class Serial(SerialBase):
         return self.local_loopback.out_waiting
 
     def dut_write(self, data):
-        return self.local_loopback.write(data)
+        # The loopback's own write() queues data a byte at a time, and the client's reader
+        # then tends to pick up the first byte of a response on its own. Queue the whole
+        # response as one item instead, so that it's read, and handed to data_received, in
+        # one go. (read() and in_waiting above deal in bytes, not items, on the client side.)
+        if not self.local_loopback.is_open:
+            raise PortNotOpenError()
+        data = bytes(data)
+        if data:
+            self.local_loopback.queue.put(data)
+        return len(data)
 
     def dut_cancel_write(self):
         self.local_loopback.cancel_write()
@@ -195,54 +222,187 @@ class Serial(SerialBase):
     # convenience functions
 
     def dut_write_str(self, data, timeout=1.0):
-        timeout_complete = time.time() + timeout
-        self.dut_write((data + "\r\n").encode("latin-1", "replace"))
+        deadline = time.monotonic_ns() + int(timeout * 1e9)
+        self.dut_write(data.encode("latin-1", "replace") + b"\r\n")
         # sit and wait for the client's ReaderThread to realize there's stuff enqueued
-        while self.dut_out_waiting > 0 and time.time() < timeout_complete:
-            pass
+        # (sleeping, so that it gets the CPU rather than us spinning on it)
+        while self.dut_out_waiting > 0 and time.monotonic_ns() < deadline:
+            time.sleep(0.0005)
+
+
+# Backreferences in a pattern, which would refer to the wrong group once it's combined with others.
+_BACKREFERENCE_RE = re.compile(r"\\(?:[1-9]|g<)|\(\?P=")
+
+# Commands' numeric arguments are almost always small, so look those up rather than parsing them.
+_SMALL_INT = {str(i): i for i in range(256)}
+
+
+def _literal_commands(pattern):
+    """\
+    List the commands a (compiled) pattern matches, if it's really just a fixed string, or a
+    few of them thanks to [Xx]-style character classes. Returns None if it's anything more.
+    """
+    body = pattern.pattern
+    if pattern.groups or not body.startswith("^") or not body.endswith("$"):
+        return None
+    body = body[1:-1]
+    commands = [""]
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if c == "\\":
+            escaped = body[i + 1 : i + 2]
+            if escaped == "x":
+                chars = chr(int(body[i + 2 : i + 4], 16))
+                i += 4
+            elif escaped and not escaped.isalnum():
+                chars = escaped
+                i += 2
+            else:
+                # a class like \d, or the $ we stripped off was escaped
+                return None
+        elif c == "[":
+            end = body.find("]", i)
+            chars = body[i + 1 : end]
+            if end < 0 or not chars.isalnum():
+                return None
+            i = end + 1
+        elif c in ".^$*+?{}[]|()":
+            return None
+        else:
+            chars = c
+            i += 1
+        commands = [command + char for command in commands for char in chars]
+    return commands
+
+
+def _combine_patterns(handlers):
+    """\
+    Combine the patterns of a group of (pattern, name, converters) handlers into one
+    alternation, with a named group per handler, so that a command only has to be matched
+    once. (The first alternative that matches wins, just as if they were tried in order.)
+
+    Returns the combined pattern's match function (or None, if there are no handlers), and a
+    map of group name to (name, converters, start, end), where groups()[start:end] are the
+    groups of the handler's own pattern.
+    """
+    if not handlers:
+        return None, {}
+    for pattern, name, _ in handlers:
+        # (flags passed to re.compile, rather than written inline, would be lost, too)
+        combinable = not pattern.groupindex and not _BACKREFERENCE_RE.search(pattern.pattern)
+        assert pattern.flags == re.UNICODE and combinable, (
+            f"{name}: {pattern.pattern!r} can't be combined with other patterns (it has flags, "
+            "backreferences, or named groups)"
+        )
+    combined = re.compile("|".join(f"(?P<h{i}>{pattern.pattern})" for i, (pattern, _, _) in enumerate(handlers)))
+    builders = {}
+    for i, (pattern, name, converters) in enumerate(handlers):
+        # (the named group comes right before the groups inside it)
+        start = combined.groupindex[f"h{i}"]
+        builders[f"h{i}"] = (name, converters, start, start + pattern.groups)
+    return combined.match, builders
 
 
 class SimulatedDevice(object):
+    # (subclasses list their own state in __slots__, too)
+    __slots__ = ("serial", "part_number")
+
+    # (pattern, handler method name) for each command, in the order they're tried. These are
+    # compiled once, here; subclasses extend this with their own commands.
+    _HANDLER_PATTERNS = ((re.compile(r"^[Nn]$"), "get_part_number"),)
+
+    # (pattern, handler method name, argument converters) for each command, and the quick
+    # ways to find them (see _build_handlers). These are the same for every instance, so
+    # they're worked out once per class, and methods are only looked up when they're called.
+    _HANDLERS = ()
+    _DISPATCH = ({}, (None, {}))
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_handlers()
+
+    @classmethod
+    def _build_handlers(cls):
+        """\
+        Work out how to handle each of the class's commands, and the quick ways to find them.
+
+        Commands that are just a fixed string (most of the queries, and things like the
+        escape-prefixed reset) are only looked up directly. The rest are combined into a single
+        pattern, which keeps their original order.
+        """
+        # Use the type annotations to cast values to the desired types (usually int)
+        # to save on boilerplate.
+        handlers = []
+        for pattern, name in cls._HANDLER_PATTERNS:
+            # (skipping self)
+            params = list(inspect.signature(getattr(cls, name)).parameters.values())[1:]
+            converters = tuple(
+                None if param.annotation is inspect.Parameter.empty else param.annotation for param in params
+            )
+            handlers.append((pattern, name, converters))
+        cls._HANDLERS = tuple(handlers)
+
+        literal = {}
+        patterned = []
+        for i, (pattern, name, converters) in enumerate(handlers):
+            commands = _literal_commands(pattern)
+            if commands is None:
+                patterned.append((pattern, name, converters))
+                continue
+            # Only the dict is checked for these; any command one of them could take is
+            # either in there, or matched by an earlier pattern that gets to keep it.
+            for command in commands:
+                if command not in literal and not any(other.match(command) for other, _, _ in handlers[:i]):
+                    literal[command] = name
+
+        cls._DISPATCH = (literal, _combine_patterns(patterned))
+
     def __init__(self, serial, part_number):
         self.serial = serial
         self.part_number = part_number
-        self.handlers = []
-
-        self.handlers.append((r"^[Nn]$", self.get_part_number))
 
     def process_write(self):
-        buffer = self.serial.dut_read(self.serial.dut_in_waiting)
+        buffer = self.serial.dut_drain()
         cmd = buffer.decode("latin-1", "replace")
 
-        for regexp, func in self.handlers:
-            m = re.match(regexp, cmd)
-            if m:
-                try:
-                    # Use the type annotations to cast values to the desired types (usually int)
-                    # to save on boilerplate
-                    params = inspect.signature(func).parameters
-                    match_groups = m.groups()
-                    match_group_id = 0
-                    manipulated_args = []
-                    for param_name in params:
-                        param_cls = params[param_name].annotation
-                        if param_cls is inspect.Parameter.empty:
-                            manipulated_args.append(match_groups[match_group_id])
-                        else:
-                            manipulated_args.append(param_cls(match_groups[match_group_id]))
-                        match_group_id += 1
-
-                    resp = func(*tuple(manipulated_args))
-                    self.serial.dut_write_str(resp)
-                except SISError as e:
-                    self.serial.dut_write_str("E{0}".format(e.code))
-                return
+        literal, (match, builders) = self._DISPATCH
+
+        name = literal.get(cmd)
+        if name is not None:
+            self._respond(getattr(self, name))
+            return
+
+        m = match(cmd) if match is not None else None
+        if m:
+            # Each handler's group encloses any groups in its own pattern, so it's the last
+            # one to close.
+            name, converters, start, end = builders[m.lastgroup]
+            self._respond(getattr(self, name), converters, m.groups()[start:end])
+            return
 
         # nothing matched
         self.serial.dut_write_str("E10")
 
+    def _respond(self, func, converters=(), groups=()):
+        """Call a handler with the groups matched from a command, and send back what it returns."""
+        try:
+            args = []
+            for converter, group in zip(converters, groups):
+                if converter is int:
+                    arg = _SMALL_INT.get(group)
+                    args.append(int(group) if arg is None else arg)
+                else:
+                    args.append(group if converter is None else converter(group))
+            resp = func(*args)
+            self.serial.dut_write_str(resp)
+        except SISError as e:
+            self.serial.dut_write_str(f"E{e.code}")
+
     def get_part_number(self) -> str:
         return self.part_number
 
 
+SimulatedDevice._build_handlers()
+
 simulator_classes: Dict[str, SimulatedDevice] = {}
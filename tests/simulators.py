@@ -0,0 +1,360 @@
+"""Simulated devices, for use with the simdev:// serial handler (see protocol_simdev)."""
+
+from sistrum import PartNumber
+from sistrum.exceptions import InvalidInputNumberError, InvalidParameterError
+from tests.protocol_simdev import SimulatedDevice
+import re
+
+
+# For each output rate code, the resolution codes it supports, and any exceptions to those.
+_RATE_SPEC = {
+    1: (range(1, 23), {15, 20, 21}),  # 50Hz
+    2: (range(1, 26), {16}),  # 60Hz
+    3: (range(1, 13), {3, 11}),  # 72Hz
+    4: ((1, 2, 4, 5, 7), ()),  # 96Hz
+    5: ((1, 2, 16), ()),  # 100Hz
+    6: ((1, 2), ()),  # 120Hz
+    7: ((15, 17, 18, 19), ()),  # 59.94Hz
+}
+
+
+# The (resolution code, rate code) pairs that can be set as the output rate. (A set, since
+# all we do with it is check membership.)
+_VALID_OUTPUT_COMBINATIONS = frozenset(
+    (x, code) for code, (resolutions, excluded) in _RATE_SPEC.items() for x in resolutions if x not in excluded
+) | {
+    (20, 3),  # 75Hz
+    # TODO: docs say that "1080p at 24 Hz" is valid, but this combination fails on my device (too-old firmware?)
+    # TODO: what about behavior of "1080p Sharp" and "1080p CVT"?
+    (19, 3),  # 24Hz
+}
+
+
+class SimulatedDVS304(SimulatedDevice):
+    __slots__ = ("video_input", "audio_input", "input_format", "color", "output_rate", "output_resolution")
+
+    # the formats each input can be set to
+    _FORMAT_RULES = {
+        # Input 1 can be CVBS or SDI
+        1: frozenset({1, 9}),
+        # Input 2 can be CVBS, S-Video, YUVi, YUVp, YUV Auto, or SDI
+        2: frozenset({1, 2, 4, 5, 8, 9}),
+        # Input 3 can be S-Video or SDI
+        3: frozenset({2, 9}),
+        # Input 4 can be any of the possible options
+        4: frozenset({1, 2, 3, 4, 5, 6, 7, 8, 9}),
+    }
+
+    # (pattern, handler method name) for each command, in the order they're tried
+    _HANDLER_PATTERNS = SimulatedDevice._HANDLER_PATTERNS + (
+        (re.compile(r"^(\d+)!$"), "set_both_input"),
+        (re.compile(r"^(\d+)&$"), "set_video_input"),
+        (re.compile(r"^(\d+)\$$"), "set_audio_input"),
+        (re.compile(r"^!$"), "get_both_input"),
+        (re.compile(r"^&$"), "get_video_input"),
+        (re.compile(r"^\$$"), "get_audio_input"),
+
+        (re.compile(r"^(\d+)\*(\d+)\\$"), "set_video_format"),
+        (re.compile(r"^(\d+)\\$"), "get_video_format"),
+
+        (re.compile(r"^(\d+)C$"), "set_color"),
+        (re.compile(r"^C$"), "get_color"),
+
+        (re.compile(r"^(\d+)\*(\d+)=$"), "set_output_rate"),
+        (re.compile(r"^=$"), "get_output_rate"),
+
+        (re.compile(r"^20S$"), "get_temperature"),
+    )
+
+    def __init__(self, serial, part_number=PartNumber.EXTRON_DVS_304):
+        super(SimulatedDVS304, self).__init__(serial, part_number)
+        self.reset()
+
+    def reset(self) -> str:
+        self.video_input = 1
+        self.audio_input = 1
+        self.input_format = bytearray([1, 2, 2, 8])
+        self.color = 64
+        self.output_rate = 1
+        self.output_resolution = 2
+        return "Zpx"
+
+    def _check_input_number(self, value):
+        # Observed behavior: Attempting to use an input "0" gives E13 instead of E01
+        if value < 0:
+            raise InvalidParameterError()
+        if value > 4:
+            raise InvalidInputNumberError()
+
+    def set_both_input(self, value: int):
+        self.set_video_input(value)
+        self.set_audio_input(value)
+        return f"In{value} All"
+
+    def set_video_input(self, value: int):
+        self._check_input_number(value)
+        self.video_input = value
+        return f"In{value} RGB"
+
+    def set_audio_input(self, value: int):
+        self._check_input_number(value)
+        self.audio_input = value
+        return f"In{value} Aud"
+
+    def get_both_input(self):
+        return self.get_video_input()
+
+    def get_video_input(self):
+        return str(self.video_input)
+
+    def get_audio_input(self):
+        return str(self.audio_input)
+
+    def set_video_format(self, index: int, value: int):
+        self._check_input_number(index)
+
+        formats = self._FORMAT_RULES.get(index)
+        if formats is not None and value not in formats:
+            raise InvalidParameterError()
+
+        self.input_format[index - 1] = value
+        return f"{index}Typ{value}"
+
+    def get_video_format(self, index: int):
+        self._check_input_number(index)
+
+        return str(self.input_format[index - 1])
+
+    def set_color(self, value: int) -> str:
+        self.color = value
+        return f"Col{self.color}"
+
+    def get_color(self) -> str:
+        return str(self.color)
+
+    def set_output_rate(self, res: int, rate: int) -> str:
+        if (res, rate) not in _VALID_OUTPUT_COMBINATIONS:
+            raise InvalidParameterError()
+        self.output_resolution = res
+        self.output_rate = rate
+        return f"Rte{self.output_resolution:02d}*{self.output_rate:02d}"
+
+    def get_output_rate(self) -> str:
+        return f"{self.output_resolution:02d}*{self.output_rate:02d}"
+
+    def get_temperature(self) -> str:
+        # sure, this seems like a temperature
+        return "45.5"
+
+
+def _single_input_info(single_input):
+    """The groups part of the status in single-input mode, e.g. "1G0 2G3 3G0 4G=2G3"."""
+    inputs = [0, 0, 0]
+
+    if single_input > 0:
+        active_group = ((single_input - 1) // 4) + 1
+        active_input = ((single_input - 1) % 4) + 1
+        inputs[active_group - 1] = active_input
+    else:
+        active_group = 1
+        active_input = 0
+
+    return f"1G{inputs[0]} 2G{inputs[1]} 3G{inputs[2]} 4G={active_group}G{active_input}"
+
+
+# ...for each of the inputs (0-12) that can be selected
+_SINGLE_INPUT_INFO = tuple(_single_input_info(single_input) for single_input in range(13))
+
+
+class SimulatedMPS112(SimulatedDevice):
+    __slots__ = (
+        "mode",
+        "single_input",
+        "separate_input",
+        "audio_group",
+        "audio_input",
+        "main_volume",
+        "mic_volume",
+        "exec_mode",
+        "mic_thresh",
+        "follow_sub_mode",
+        "mic_power",
+        "ducking_level",
+        "audio_mute",
+        "mic_on",
+    )
+
+    # (pattern, handler method name) for each command, in the order they're tried
+    _HANDLER_PATTERNS = SimulatedDevice._HANDLER_PATTERNS + (
+        (re.compile(r"^(\d+)\*(\d+)!$"), "select_separate"),
+        (re.compile(r"^(\d+)!"), "select_single"),
+
+        (re.compile(r"^(\d+)V$"), "set_volume"),
+        (re.compile(r"^V$"), "get_volume"),
+        (re.compile(r"^(\d+)[Zz]$"), "set_audio_mute"),
+        (re.compile(r"^[Zz]$"), "get_audio_mute"),
+        (re.compile(r"^[Xx]$"), "get_exec_mode"),
+
+        (re.compile(r"^[Qq]$"), "get_firmware_version"),
+
+        (re.compile(r"^16\*(\d+)G$"), "set_mic_gain"),
+        (re.compile(r"^16\*(\d+)g$"), "set_mic_attenuation"),
+        (re.compile(r"^16[Gg]"), "get_mic_volume"),
+
+        (re.compile(r"^(\d+)[Mm]$"), "set_mic"),
+        (re.compile(r"^[Mm]$"), "get_mic"),
+
+        (re.compile(r"^(\d+)[Xx]$"), "set_exec_mode"),
+
+        (re.compile(r"^\x1BZXXX$"), "reset"),
+
+        (re.compile(r"^[Ii]$"), "get_info"),
+
+        (re.compile(r"^(\d+)\*1#$"), "set_switcher_mode"),
+        (re.compile(r"^1#$"), "get_switcher_mode"),
+
+        (re.compile(r"^(\d+)\*2#$"), "set_mic_thresh"),
+        (re.compile(r"^2#$"), "get_mic_thresh"),
+    )
+
+    def __init__(self, serial, part_number=PartNumber.EXTRON_MPS_112):
+        super(SimulatedMPS112, self).__init__(serial, part_number)
+        self.reset()
+
+    def reset(self) -> str:
+        self.mode = 1
+        self.single_input = 0
+        self.separate_input = bytearray([1, 1, 1])
+        self.audio_group = 1
+        self.audio_input = 0
+        self.main_volume = 70
+        self.mic_volume = 0
+        self.exec_mode = 0
+        self.mic_thresh = 8
+        self.follow_sub_mode = 0
+        self.mic_power = 0
+        self.ducking_level = 6
+        self.audio_mute = 0
+        self.mic_on = 0
+        return "Zpx"
+
+    # TODO: figure out all the rules for transitioning between
+    # single and separate switcher mode
+
+    def select_separate(self, group: int, input: int) -> str:
+        if group < 1 or group > 3:
+            raise InvalidParameterError()
+        if input < 0 or input > 4:
+            raise InvalidParameterError()
+
+        if self.mode == 1:
+            # single-switcher mode: just set the input, all others are off
+            self.single_input = input
+        else:
+            # separate-switcher mode
+            self.separate_input[(group - 1)] = input
+            self.audio_group = group
+            self.audio_input = input
+
+        return f"Chn{group}*{input}"
+
+    def select_single(self, input: int) -> str:
+        if input < 0 or input > 12:
+            raise InvalidParameterError()
+
+        # command is not valid in separate-switcher mode
+        if self.mode == 2:
+            raise InvalidInputNumberError()
+
+        self.single_input = input
+
+        return f"Chn{input}"
+
+    def set_volume(self, volume: int) -> str:
+        if volume < 0 or volume > 100:
+            raise InvalidParameterError()
+
+        self.main_volume = volume
+        return f"Vol{self.main_volume}"
+
+    def get_volume(self) -> str:
+        return str(self.main_volume)
+
+    def set_audio_mute(self, audio_mute: int) -> str:
+        if audio_mute < 0 or audio_mute > 1:
+            raise InvalidParameterError()
+
+        self.audio_mute = audio_mute
+        return f"Amt{self.audio_mute}"
+
+    def get_audio_mute(self) -> str:
+        return str(self.audio_mute)
+
+    def get_firmware_version(self) -> str:
+        return "1.02"
+
+    def set_exec_mode(self, exec_mode: int) -> str:
+        if exec_mode < 0 or exec_mode > 3:
+            raise InvalidParameterError()
+
+        self.exec_mode = exec_mode
+        return f"Exe{self.exec_mode}"
+
+    def get_exec_mode(self) -> str:
+        return str(self.exec_mode)
+
+    def set_mic_gain(self, mic_gain: int) -> str:
+        if mic_gain < 0 or mic_gain > 12:
+            raise InvalidParameterError()
+
+        self.mic_volume = mic_gain
+
+        return f"Aud+{mic_gain}"
+
+    def set_mic_attenuation(self, mic_att: int) -> str:
+        if mic_att < 1 or mic_att > 66:
+            raise InvalidParameterError()
+
+        self.mic_volume = -mic_att
+
+        return f"Aud-{mic_att}"
+
+    def get_mic_volume(self) -> str:
+        return str(self.mic_volume)
+
+    def set_mic(self, mic_on: int) -> str:
+        if mic_on < 0 or mic_on > 1:
+            raise InvalidParameterError()
+        self.mic_on = mic_on
+        return f"Mix{self.mic_on}"
+
+    def get_mic(self) -> str:
+        return str(self.mic_on)
+
+    def get_info(self) -> str:
+        if self.mode == 1:
+            # single-input mode
+            return f"Mod{self.mode} {_SINGLE_INPUT_INFO[self.single_input]}"
+        else:
+            # separate-input mode
+            g1, g2, g3 = self.separate_input
+            return f"Mod{self.mode} 1G{g1} 2G{g2} 3G{g3} 4G={self.audio_group}G{self.audio_input}"
+
+    def set_switcher_mode(self, mode: int) -> str:
+        if mode < 1 or mode > 2:
+            raise InvalidParameterError()
+
+        self.mode = mode
+        return f"Mod{self.mode}"
+
+    def get_switcher_mode(self) -> str:
+        return str(self.mode)
+
+    def set_mic_thresh(self, thresh: int) -> str:
+        if thresh < 0 or thresh > 15:
+            raise InvalidParameterError()
+        self.mic_thresh = thresh
+        return f"Thr{self.mic_thresh}"
+
+    def get_mic_thresh(self) -> str:
+        return str(self.mic_thresh)
@@ -1,6 +1,12 @@
 from sistrum import Event, ValueChangeEvent, IndexValueChangeEvent
+from sistrum._protocol import ExtronProtocol
+from sistrum._event import _BOOL_VALUE_CONVERTER, _INT_VALUE_CONVERTER, EnumValueConverter, generic_event_property
+from sistrum._event import _literal_prefix, _to_api_fn
+import pytest  # type: ignore
 
 class EventSource():
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -34,3 +40,100 @@ def test_index_value_change_event():
     assert ev.index == 2
     assert ev.value == 42
 
+
+def test_literal_prefix():
+    assert _literal_prefix(r"^Vol(\d+)$") == "Vol"
+    assert _literal_prefix(r"^Reconfig$") == "Reconfig"
+    assert _literal_prefix(r"^(\d)Typ(\d)$") == ""
+    assert _literal_prefix(r"^Ab*c$") == "A"
+    assert _literal_prefix(r"^Vol|^Amt$") == ""
+    assert _literal_prefix(r"Vol(\d+)$") == ""
+
+
+def test_value_converter_to_api():
+    assert _to_api_fn(_BOOL_VALUE_CONVERTER)("1") is True
+    assert _to_api_fn(_BOOL_VALUE_CONVERTER)("0") is False
+    assert _to_api_fn(_INT_VALUE_CONVERTER)("42") == 42
+    assert _to_api_fn(EnumValueConverter({"1": "one", "2": "two"}))("2") == "two"
+
+
+def test_bool_value_converter_decodes_zero_as_false():
+    # the device reports bools as "0"/"1", and bool("0") is True
+    assert _BOOL_VALUE_CONVERTER.to_api("0") is False
+    assert _BOOL_VALUE_CONVERTER.to_api("1") is True
+
+
+def test_bool_value_converter_to_raw():
+    assert _BOOL_VALUE_CONVERTER.to_raw(True) == "1"
+    assert _BOOL_VALUE_CONVERTER.to_raw(False) == "0"
+    assert _BOOL_VALUE_CONVERTER.to_raw(0) == "0"
+
+    # not sent as "1" just because the string isn't empty
+    with pytest.raises(ValueError):
+        _BOOL_VALUE_CONVERTER.to_raw("0")
+
+
+def test_uncombinable_event_patterns():
+    # global flags and backreferences can't go in the combined pattern, so these are matched
+    # on their own (and the class can still be created at all)
+    class Protocol(ExtronProtocol):
+        flagged = generic_event_property(None, int, set_cmd_response=r"(?i)^vol(\d+)$")
+        backref = generic_event_property(None, int, set_cmd_response=r"^(\d)x\1$")
+        named = generic_event_property(None, int, set_cmd_response=r"^Thr(?P<value>\d+)$")
+        plain = generic_event_property(None, int, set_cmd_response=r"^Amt(\d+)$")
+
+    protocol = Protocol()
+    events = []
+    protocol.add_event_listener("*", lambda ev: events.append((ev.name, ev.value)))
+
+    for line in ["VOL5", "3x3", "3x4", "Thr9", "Amt1"]:
+        protocol.handle_line(line)
+    assert events == [("flagged", 5), ("backref", 3), ("named", 9), ("plain", 1)]
+
+
+def test_data_received_split_across_chunks():
+    class Protocol(ExtronProtocol):
+        volume = generic_event_property(None, int, set_cmd_response=r"^Vol(\d+)$")
+
+    protocol = Protocol()
+    events = []
+    protocol.add_event_listener("volume", lambda ev: events.append(ev.value))
+
+    # a line split mid-line, then mid-terminator, and two lines arriving in one chunk
+    for chunk in [b"Vo", b"l1", b"2\r", b"\nVol3\r\nVol", b"45\r\n"]:
+        protocol.data_received(chunk)
+    assert events == [12, 3, 45]
+    assert protocol.buffer == b""
+
+
+def test_listeners_called_in_registration_order():
+    class Protocol(ExtronProtocol):
+        volume = generic_event_property(None, int, set_cmd_response=r"^Vol(\d+)$")
+
+    protocol = Protocol()
+    calls = []
+
+    def star(ev):
+        calls.append("star")
+        return True
+
+    def named(ev):
+        calls.append("named")
+
+    # a "*" listener added first, which stops the rest
+    protocol.add_event_listener("*", star)
+    protocol.add_event_listener("volume", named)
+    protocol.handle_line("Vol1")
+    assert calls == ["star"]
+
+    # the same listener added twice is called twice, until it's removed (once per add)
+    calls.clear()
+    protocol.remove_event_listener("*", star)
+    protocol.add_event_listener("volume", named)
+    protocol.handle_line("Vol2")
+    assert calls == ["named", "named"]
+
+    calls.clear()
+    protocol.remove_event_listener("volume", named)
+    protocol.handle_line("Vol3")
+    assert calls == ["named"]
@@ -0,0 +1,15 @@
+from sistrum.exceptions import SISError, InvalidInputNumberError, HardwareFailureError, exception_from_error_code
+
+
+def test_exception_from_error_code():
+    exc = exception_from_error_code("E01")
+    assert isinstance(exc, InvalidInputNumberError)
+    assert exc.code == 1
+    assert str(exc) == "Invalid input number"
+
+    assert isinstance(exception_from_error_code("E1"), InvalidInputNumberError)
+    assert isinstance(exception_from_error_code("E30"), HardwareFailureError)
+
+    exc = exception_from_error_code("E99")
+    assert type(exc) is SISError
+    assert exc.code == "E99"
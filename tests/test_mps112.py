@@ -1,211 +1,10 @@
+from copy import copy
 from sistrum import ExtronDevice
-from sistrum import PartNumber, SwitcherMode, InputVideoFormat
-from sistrum.exceptions import InvalidInputNumberError, InvalidParameterError
-from tests.protocol_simdev import simulator_classes, SimulatedDevice
+from sistrum import PartNumber, SwitcherMode, ExecutiveMode
+from sistrum.exceptions import InvalidParameterError
 import pytest  # type: ignore
-import logging
-import re
-import time
-
-
-class SimulatedMPS112(SimulatedDevice):
-    def __init__(self, serial, part_number=PartNumber.EXTRON_MPS_112):
-        super(SimulatedMPS112, self).__init__(serial, part_number)
-        self.reset()
-
-        self.handlers.append((r"^(\d+)\*(\d+)!$", self.select_separate))
-        self.handlers.append((r"^(\d+)!", self.select_single))
-
-        self.handlers.append((r"^(\d+)V$", self.set_volume))
-        self.handlers.append((r"^V$", self.get_volume))
-        self.handlers.append((r"^(\d+)[Zz]$", self.set_audio_mute))
-        self.handlers.append((r"^[Zz]$", self.get_audio_mute))
-        self.handlers.append((r"^[Xx]$", self.get_exec_mode))
-
-        self.handlers.append((r"^[Qq]$", self.get_firmware_version))
-
-        self.handlers.append((r"^16\*(\d+)G$", self.set_mic_gain))
-        self.handlers.append((r"^16\*(\d+)g$", self.set_mic_attenuation))
-        self.handlers.append((r"^16[Gg]", self.get_mic_volume))
-
-        self.handlers.append((r"^(\d+)[Mm]$", self.set_mic))
-        self.handlers.append((r"^[Mm]$", self.get_mic))
-
-        self.handlers.append((r"^(\d+)[Xx]$", self.set_exec_mode))
-
-        ESCAPE = "\x1B"
-        self.handlers.append((r"^" + ESCAPE + r"ZXXX$", self.reset))
-
-        self.handlers.append((r"^[Ii]$", self.get_info))
-
-        self.handlers.append((r"^(\d+)\*1#$", self.set_switcher_mode))
-        self.handlers.append((r"^1#$", self.get_switcher_mode))
-
-        self.handlers.append((r"^(\d+)\*2#$", self.set_mic_thresh))
-        self.handlers.append((r"^2#$", self.get_mic_thresh))
-
-    def reset(self) -> str:
-        self.mode = 1
-        self.single_input = 0
-        self.separate_input = [1, 1, 1]
-        self.audio_group = 1
-        self.audio_input = 0
-        self.main_volume = 70
-        self.mic_volume = 0
-        self.exec_mode = 0
-        self.mic_thresh = 8
-        self.follow_sub_mode = 0
-        self.mic_power = 0
-        self.ducking_level = 6
-        self.audio_mute = 0
-        self.mic_on = 0
-        return "Zpx"
-
-    # TODO: figure out all the rules for transitioning between
-    # single and separate switcher mode
-
-    def select_separate(self, group: int, input: int) -> str:
-        if group < 1 or group > 3:
-            raise InvalidParameterError()
-        if input < 0 or input > 4:
-            raise InvalidParameterError()
-
-        if self.mode == 1:
-            # single-switcher mode: just set the input, all others are off
-            self.single_input = input
-        else:
-            # separate-switcher mode
-            self.separate_input[(group - 1)] = input
-            self.audio_group = group
-            self.audio_input = input
-
-        return "Chn{0}*{1}".format(group, input)
-
-    def select_single(self, input: int) -> str:
-        if input < 0 or input > 12:
-            raise InvalidParameterError()
-
-        # command is not valid in separate-switcher mode
-        if self.mode == 2:
-            raise InvalidInputNumberError()
-
-        self.single_input = input
-
-        return "Chn{0}".format(input)
-
-    def set_volume(self, volume: int) -> str:
-        if volume < 0 or volume > 100:
-            raise InvalidParameterError()
-
-        self.main_volume = volume
-        return "Vol{0}".format(self.main_volume)
-
-    def get_volume(self) -> str:
-        return "{0}".format(self.main_volume)
-
-    def set_audio_mute(self, audio_mute: int) -> str:
-        if audio_mute < 0 or audio_mute > 1:
-            raise InvalidParameterError()
-
-        self.audio_mute = audio_mute
-        return "Amt{0}".format(self.audio_mute)
-
-    def get_audio_mute(self) -> str:
-        return "{0}".format(self.audio_mute)
-
-    def get_firmware_version(self) -> str:
-        return "1.02"
-
-    def set_exec_mode(self, exec_mode: int) -> str:
-        if exec_mode < 0 or exec_mode > 3:
-            raise InvalidParameterError()
-
-        self.exec_mode = exec_mode
-        return "Exe{0}".format(self.exec_mode)
-
-    def get_exec_mode(self) -> str:
-        return "{0}".format(self.exec_mode)
-
-    def set_mic_gain(self, mic_gain: int) -> str:
-        if mic_gain < 0 or mic_gain > 12:
-            raise InvalidParameterError()
-
-        self.mic_volume = mic_gain
-
-        return "Aud+{0}".format(mic_gain)
-
-    def set_mic_attenuation(self, mic_att: int) -> str:
-        if mic_att < 1 or mic_att > 66:
-            raise InvalidParameterError()
-
-        self.mic_volume = -mic_att
-
-        return "Aud-{0}".format(mic_att)
-
-    def get_mic_volume(self) -> str:
-        return "{0}".format(self.mic_volume)
-
-    def set_mic(self, mic_on: int) -> str:
-        if mic_on < 0 or mic_on > 1:
-            raise InvalidParameterError()
-        self.mic_on = mic_on
-        return "Mix{0}".format(self.mic_on)
-
-    def get_mic(self) -> str:
-        return "{0}".format(self.mic_on)
-
-    def get_info(self) -> str:
-        if self.mode == 1:
-            # single-input mode
-            inputs = [0, 0, 0]
-
-            if self.single_input > 0:
-                active_group = ((self.single_input - 1) // 4) + 1
-                active_input = ((self.single_input - 1) % 4) + 1
-                inputs[active_group - 1] = active_input
-            else:
-                active_group = 1
-                active_input = 0
-
-            return "Mod{mode} 1G{g1} 2G{g2} 3G{g3} 4G={audgroup}G{audinput}".format(
-                mode=self.mode, g1=inputs[0], g2=inputs[1], g3=inputs[2], audgroup=active_group, audinput=active_input
-            )
-        else:
-            # separate-input mode
-            return "Mod{mode} 1G{g1} 2G{g2} 3G{g3} 4G={audgroup}G{audinput}".format(
-                mode=self.mode,
-                g1=self.separate_input[0],
-                g2=self.separate_input[1],
-                g3=self.separate_input[2],
-                audgroup=self.audio_group,
-                audinput=self.audio_input,
-            )
-
-    def set_switcher_mode(self, mode: int) -> str:
-        if mode < 1 or mode > 2:
-            raise InvalidParameterError()
-
-        self.mode = mode
-        return "Mod{0}".format(self.mode)
-
-    def get_switcher_mode(self) -> str:
-        return "{0}".format(self.mode)
-
-    def set_mic_thresh(self, thresh: int) -> str:
-        if thresh < 0 or thresh > 15:
-            raise InvalidParameterError()
-        self.mic_thresh = thresh
-        return "Thr{0}".format(self.mic_thresh)
-
-    def get_mic_thresh(self) -> str:
-        return "{0}".format(self.mic_thresh)
-
-
-@pytest.fixture(scope="package", autouse=True)
-def register_simulator():
-    simulator_classes["mps112"] = SimulatedMPS112
-    yield
-    del simulator_classes["mps112"]
+import sistrum.device_mps112
+from sistrum.device_mps112 import _separate_to_single_input
 
 
 def test_mps112_auto():
@@ -224,6 +23,17 @@ def test_mps112_volume():
             protocol.volume = 256
 
 
+def test_mps112_executive_mode():
+    dev = ExtronDevice("simdev://mps112", part_number=PartNumber.EXTRON_MPS_112)
+    with dev as protocol:
+        # the "Exe" response to a set isn't an error, despite starting with "E"
+        protocol.executive_mode = ExecutiveMode.COMPLETE
+        assert protocol.executive_mode == ExecutiveMode.COMPLETE
+
+        protocol.executive_mode = ExecutiveMode.UNLOCKED
+        assert protocol.executive_mode == ExecutiveMode.UNLOCKED
+
+
 def test_mps112_input_single():
     dev = ExtronDevice("simdev://mps112", part_number=PartNumber.EXTRON_MPS_112)
     with dev as protocol:
@@ -247,6 +57,49 @@ def test_mps112_input_separate():
                 assert protocol.input[group] == i
 
 
+def test_mps112_status_reused_for_indexing(monkeypatch):
+    dev = ExtronDevice("simdev://mps112", part_number=PartNumber.EXTRON_MPS_112)
+    with dev as protocol:
+        # freeze the clock, so that the cached status can't expire partway through
+        monkeypatch.setattr(sistrum.device_mps112.time, "monotonic", lambda: 1000.0)
+
+        protocol.switcher_mode = SwitcherMode.SEPARATE
+        protocol.input[2] = 3
+
+        requests = []
+        write = protocol.transport.write
+
+        def counting_write(data):
+            requests.append(data)
+            return write(data)
+
+        protocol.transport.write = counting_write
+
+        inputs = protocol.input
+        assert [inputs[group] for group in [1, 2, 3]] == [1, 3, 1]
+        assert requests == [b"I"]
+
+        # callers can't modify the cached status
+        with pytest.raises(TypeError):
+            protocol.status.input[2] = 4
+        with pytest.raises(AttributeError):
+            protocol.status.mode = SwitcherMode.SINGLE
+
+        # a change must not be hidden by the cached status...
+        protocol.input[2] = 1
+        assert protocol.input[2] == 1
+
+        # ...including one made on the front panel, which the switcher tells us about
+        requests.clear()
+        assert protocol.input[2] == 1
+        assert requests == []
+        simdev = protocol.transport.serial.simdev
+        simdev.select_separate(2, 2)
+        simdev_write_line(protocol, "Chn2*2")
+        assert protocol.input[2] == 2
+        assert requests == [b"I"]
+
+
 def test_mps112_input_works_like_an_int():
     dev = ExtronDevice("simdev://mps112", part_number=PartNumber.EXTRON_MPS_112)
     with dev as protocol:
@@ -273,8 +126,6 @@ def test_mps112_input_works_like_an_int():
 
 
 def test_mps112_input_works_like_a_dict():
-    from copy import copy
-
     dev = ExtronDevice("simdev://mps112", part_number=PartNumber.EXTRON_MPS_112)
     with dev as protocol:
         protocol.switcher_mode = SwitcherMode.SEPARATE
@@ -411,8 +262,6 @@ def test_mps112_test_volume_notifications():
 
 
 def test_mps112_separate_to_single_input():
-    from sistrum.device_mps112 import _separate_to_single_input
-
     CASES = [
         ((1, 0), 0),
         ((1, 1), 1),
@@ -436,3 +285,55 @@ def test_mps112_separate_to_single_input():
 
         assert _separate_to_single_input(group, input) == expected
 
+
+def test_mps112_wildcard_listener():
+    dev = ExtronDevice("simdev://mps112", part_number=PartNumber.EXTRON_MPS_112)
+    with dev as protocol:
+        events = []
+
+        def handle_any_event(ev):
+            events.append((ev.name, ev.value))
+
+        protocol.add_event_listener("*", handle_any_event)
+
+        simdev_write_line(protocol, "Vol40")
+        simdev_write_line(protocol, "Amt1")
+        simdev_write_line(protocol, "Thr9")
+        assert events == [("volume", 40), ("mute", 1), ("mic_threshold", 9)]
+
+        protocol.remove_event_listener("*", handle_any_event)
+        simdev_write_line(protocol, "Vol41")
+        assert len(events) == 3
+
+        with pytest.raises(ValueError):
+            protocol.remove_event_listener("*", handle_any_event)
+        with pytest.raises(ValueError):
+            protocol.remove_event_listener("volume", handle_any_event)
+
+
+def test_mps112_listener_removal_during_dispatch():
+    dev = ExtronDevice("simdev://mps112", part_number=PartNumber.EXTRON_MPS_112)
+    with dev as protocol:
+        calls = []
+
+        def first(ev):
+            calls.append("first")
+            # remove ourselves and the listener after us, and add a new one
+            protocol.remove_event_listener("volume", first)
+            protocol.remove_event_listener("volume", second)
+            protocol.add_event_listener("volume", third)
+
+        def second(ev):
+            calls.append("second")
+
+        def third(ev):
+            calls.append("third")
+
+        protocol.add_event_listener("volume", first)
+        protocol.add_event_listener("volume", second)
+
+        simdev_write_line(protocol, "Vol40")
+        assert calls == ["first"]
+
+        simdev_write_line(protocol, "Vol41")
+        assert calls == ["first", "third"]
@@ -1,3 +1,5 @@
+from fractions import Fraction
+import gc
 from sistrum._resolution import Resolution, AspectRatio
 import pytest
 
@@ -19,6 +21,9 @@ def test_comparisons():
     assert Resolution(800, 600) > Resolution(640, 480)
     assert Resolution(800, 600) >= Resolution(640, 480)
     assert Resolution(800, 600) >= Resolution(800, 600)
+    assert Resolution(640, 480) <= Resolution(640, 480)
+    assert Resolution(640, 480) <= Resolution(800, 600)
+    assert not Resolution(640, 480) > Resolution(640, 480)
 
 
 def test_fromstring():
@@ -68,6 +73,37 @@ def test_from_bad_type():
         assert Resolution((1, 2, 3))
 
 
+def test_interned():
+    assert Resolution("480p") is Resolution(720, 480)
+    assert Resolution(Resolution(640, 480)) is Resolution(640, 480)
+    assert Resolution("1080p Sharp") is not Resolution("1080p")
+
+
+def test_interned_weakly():
+    key = (1234, 567, False, False, False)
+    res = Resolution(1234, 567)
+    assert Resolution._interned[key] is res
+    del res
+    gc.collect()
+    assert key not in Resolution._interned
+
+
+def test_interned_normalizes_arguments():
+    assert str(Resolution(1111.0, 222)) == "1111x222"
+    assert str(Resolution(1111, 222)) == "1111x222"
+    assert Resolution(3333, 444, interlaced=1).interlaced is True
+    assert Resolution(3333, 444, interlaced=True).interlaced is True
+
+
+def test_compare_with_other_types():
+    assert Resolution("480p") != "480p"
+    assert not Resolution("480p") == "480p"
+    assert not Resolution("480p") == None  # noqa: E711
+
+    with pytest.raises(TypeError):
+        assert Resolution("480p") < "480p"
+
+
 def test_hash():
     assert hash(Resolution(640, 480)) == hash(Resolution(640, 480))
     assert hash(Resolution(640, 480)) != hash(Resolution(800, 600))
@@ -83,6 +119,8 @@ def test_aspect_ratio():
     assert AspectRatio("4:3") == AspectRatio(4, 3)
     assert str(AspectRatio("400:300")) == "4:3"
     assert str(AspectRatio(400, 300)) == "4:3"
+    assert str(AspectRatio(Fraction(16, 9))) == "16:9"
+    assert str(AspectRatio(1.5)) == "3:2"
 
     with pytest.raises(ValueError):
         AspectRatio("-1:1")